@@ -0,0 +1,322 @@
+"""
+Нагрузочный бенчмарк эндпоинтов API.
+
+Наполняет базу синтетическими данными заданного масштаба, выполняет
+запросы к каждому эндпоинту из api/urls.py через клиент Django в текущем
+процессе и сохраняет p50/p99 задержки, RPS, число SQL-запросов и пиковую
+память в JSON-файл для сравнения между коммитами.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_api.py --scale 10k --output bench.json
+"""
+import argparse
+import base64
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import count
+
+from common import SEARCH_TOPICS, User, create_database, parse_scale, populate
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.pagination import KeysetPagination
+from posts.models import Post
+
+BENCH_PASSWORD = "bench-password"
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def make_client(user=None, accept_encoding=None):
+    client = APIClient(raise_request_exception=False)
+    if accept_encoding:
+        client.defaults["HTTP_ACCEPT_ENCODING"] = accept_encoding
+    if user is not None:
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+def build_scenarios(author):
+    """
+    Возвращает сценарии: имя, пользователя, функцию, выполняющую один
+    запрос, и необязательную подготовку. Функция получает клиент
+    и порядковый номер запроса, подготовка — число запросов сценария.
+    """
+    published = Post.objects.filter(is_published=True)
+    middle = published.order_by("-created", "-id")[published.count() // 2]
+    deep_cursor = KeysetPagination.make_cursor((middle.created, middle.id))
+    own_posts = list(
+        Post.objects.filter(author=author).values_list("id", flat=True)
+    )
+    names = count()
+    author.set_password(BENCH_PASSWORD)
+    author.save(update_fields=["password"])
+    credentials = base64.b64encode(
+        f"{author.username}:{BENCH_PASSWORD}".encode()
+    ).decode()
+
+    def make_pool(size):
+        """
+        Черновики автора для сценариев удаления: по size постов
+        на запрос, чтобы каждый запрос удалял существующие посты.
+        """
+        pool = []
+
+        def prepare(requests):
+            batch = next(names)
+            pool[:] = [
+                post.pk
+                for post in Post.objects.bulk_create(
+                    Post(name=f"Удаляемый {batch}-{item}", author=author)
+                    for item in range(requests * size)
+                )
+            ]
+
+        return pool, prepare
+
+    deletable, prepare_delete = make_pool(1)
+    bulk_deletable, prepare_bulk_delete = make_pool(100)
+
+    def create_post(client, number):
+        return client.post(
+            "/posts/",
+            data={"name": f"Новый пост {next(names)}", "text": "Текст"},
+        )
+
+    def export_first_chunk(client, number):
+        response = client.get("/posts/export/")
+        next(iter(response.streaming_content))
+        return response
+
+    def delete_post(client, number):
+        return client.delete(f"/posts/{deletable[number]}/")
+
+    def bulk_update(client, number):
+        return client.patch(
+            "/posts/bulk/",
+            data=[
+                {"id": pk, "text": f"Пакетная правка {number}"}
+                for pk in own_posts[:100]
+            ],
+            format="json",
+        )
+
+    def bulk_delete(client, number):
+        start, end = number * 100, (number + 1) * 100
+        return client.delete(
+            "/posts/bulk/",
+            data=bulk_deletable[start:end],
+            format="json",
+        )
+
+    def obtain_token(client, number):
+        return client.post(
+            "/auth/token/", HTTP_AUTHORIZATION=f"Basic {credentials}"
+        )
+
+    def bulk_create(client, number):
+        batch = next(names)
+        return client.post(
+            "/posts/bulk/",
+            data=[
+                {"name": f"Пакет {batch}-{item}", "text": "Текст"}
+                for item in range(100)
+            ],
+            format="json",
+        )
+
+    return {
+        "list_anonymous": (
+            None,
+            lambda client, number: client.get("/posts/"),
+        ),
+        "list_authorized": (
+            author,
+            lambda client, number: client.get("/posts/"),
+        ),
+        "list_sparse": (
+            author,
+            lambda client, number: client.get(
+                "/posts/", data={"fields": "id,name,author,created"}
+            ),
+        ),
+        "list_deep_cursor": (
+            author,
+            lambda client, number: client.get(
+                "/posts/", data={"cursor": deep_cursor}
+            ),
+        ),
+        "detail": (
+            author,
+            lambda client, number: client.get(
+                f"/posts/{own_posts[number % len(own_posts)]}/"
+            ),
+        ),
+        "create": (author, create_post),
+        "update": (
+            author,
+            lambda client, number: client.patch(
+                f"/posts/{own_posts[number % len(own_posts)]}/",
+                data={"text": f"Измененный текст {number}"},
+            ),
+        ),
+        "search": (
+            None,
+            lambda client, number: client.get(
+                "/posts/", data={"q": f"тема{number % SEARCH_TOPICS}"}
+            ),
+        ),
+        "search_rare": (
+            None,
+            lambda client, number: client.get(
+                "/posts/", data={"q": f"поста {number}"}
+            ),
+        ),
+        "delete": (author, delete_post, prepare_delete),
+        "bulk_create_100": (author, bulk_create),
+        "bulk_update_100": (author, bulk_update),
+        "bulk_delete_100": (author, bulk_delete, prepare_bulk_delete),
+        "export_first_chunk": (None, export_first_chunk),
+        "changes": (
+            None,
+            lambda client, number: client.get("/posts/changes/"),
+        ),
+        "stats": (None, lambda client, number: client.get("/posts/stats/")),
+        "stats_author": (
+            None,
+            lambda client, number: client.get(
+                "/posts/stats/", data={"author": author.username}
+            ),
+        ),
+        "token": (None, obtain_token),
+        "metrics": (None, lambda client, number: client.get("/metrics/")),
+    }
+
+
+def run_scenario(user, request, requests, threads, accept_encoding=None):
+    latencies = []
+    errors = []
+
+    def worker(numbers):
+        client = make_client(user, accept_encoding)
+        for number in numbers:
+            started = time.perf_counter()
+            response = request(client, number)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+
+    chunks = [range(index, requests, threads) for index in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, chunks))
+    elapsed = time.perf_counter() - started
+
+    client = make_client(user, accept_encoding)
+    with CaptureQueriesContext(connection) as context:
+        response = request(client, requests)
+    queries = len(context.captured_queries)
+    response_bytes = 0 if response.streaming else len(response.content)
+
+    tracemalloc.start()
+    request(client, requests + 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "rps": round(requests / elapsed, 1),
+        "queries": queries,
+        "response_bytes": response_bytes,
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", default="10k", help="10k, 100k, 1M")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--only", nargs="+", help="Имена сценариев")
+    parser.add_argument(
+        "--db-file",
+        help="Файл базы SQLite (нужен для запуска в несколько потоков)",
+    )
+    parser.add_argument(
+        "--accept-encoding",
+        help="Заголовок Accept-Encoding запросов, например gzip или br",
+    )
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args()
+
+    posts = parse_scale(args.scale)
+    create_database(args.db_file)
+    started = time.perf_counter()
+    authors = populate(posts, users=args.users)
+    populate_seconds = time.perf_counter() - started
+    author = User.objects.get(pk=authors[0].pk)
+
+    results = {}
+    for name, (user, request, *prepare) in build_scenarios(author).items():
+        if args.only and name not in args.only:
+            continue
+        for setup in prepare:
+            # Кроме замеряемых, run_scenario выполняет еще два запроса.
+            setup(args.requests + 2)
+        results[name] = run_scenario(
+            user, request, args.requests, args.threads, args.accept_encoding
+        )
+        print(
+            f"{name:<20} p50 {results[name]['p50_ms']:>8.2f} мс  "
+            f"p99 {results[name]['p99_ms']:>8.2f} мс  "
+            f"{results[name]['rps']:>8.1f} rps  "
+            f"{results[name]['queries']:>3} SQL  "
+            f"{results[name]['response_bytes']:>7} Б  "
+            f"{results[name]['peak_memory_kb']:>9.1f} КБ  "
+            f"ошибок {results[name]['errors']}"
+        )
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": connection.vendor,
+        "scale": posts,
+        "users": args.users,
+        "threads": args.threads,
+        "accept_encoding": args.accept_encoding,
+        "populate_seconds": round(populate_seconds, 2),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Сравнение рендеринга и сжатия страницы постов: JSONRenderer из DRF
+против ORJSONRenderer, а также размер и время сжатия ответа gzip и brotli.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_rendering.py --posts 10000 --repeat 20
+"""
+import argparse
+import statistics
+import timeit
+
+from common import create_database, populate
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import CompressionMiddleware, brotli
+from api.renderers import ORJSONRenderer
+from api.representations import post_representations, post_values
+from posts.models import Post
+
+
+def measure(func, repeat):
+    """Медиана времени одного вызова в миллисекундах."""
+    return statistics.median(timeit.repeat(func, number=1, repeat=repeat)) * (
+        1000
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--limit", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    create_database()
+    populate(args.posts, published_ratio=1)
+
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    print(
+        f"{'строк':>6} {'DRF, мс':>9} {'orjson, мс':>11} "
+        f"{'ускорение':>10} {'размер':>9}"
+        + "".join(
+            f" {name + ', байт':>12} {name + ', мс':>9}" for name in encodings
+        )
+    )
+    for limit in args.limit:
+        data = {
+            "next": None,
+            "previous": None,
+            "results": post_representations(
+                post_values(Post.objects.filter(is_published=True))[:limit]
+            ),
+        }
+        content = ORJSONRenderer().render(data)
+        assert content == JSONRenderer().render(
+            data
+        ), "Вывод рендереров различается"
+
+        drf = measure(lambda: JSONRenderer().render(data), args.repeat)
+        fast = measure(lambda: ORJSONRenderer().render(data), args.repeat)
+        line = (
+            f"{limit:>6} {drf:>9.3f} {fast:>11.3f} "
+            f"{drf / fast:>9.1f}x {len(content):>9}"
+        )
+        for encoding in encodings:
+            compressed = CompressionMiddleware.compress(content, encoding)
+            elapsed = measure(
+                lambda: CompressionMiddleware.compress(content, encoding),
+                args.repeat,
+            )
+            line += f" {len(compressed):>12} {elapsed:>9.3f}"
+        print(line)
+
+    print(
+        f"Уровень gzip: {settings.COMPRESSION_GZIP_LEVEL}, "
+        f"качество brotli: {settings.COMPRESSION_BROTLI_QUALITY}, "
+        f"порог сжатия: {settings.COMPRESSION_MIN_SIZE} байт"
+    )
+
+
+if __name__ == "__main__":
+    main()
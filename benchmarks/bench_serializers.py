@@ -0,0 +1,65 @@
+"""
+Сравнение сериализации списка постов: PostSerializer + JSONRenderer
+против values() + post_representation + ORJSONRenderer.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_serializers.py --posts 10000 --repeat 5
+"""
+import argparse
+import statistics
+import timeit
+
+from common import create_database, populate
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import ORJSONRenderer
+from api.representations import post_representation, post_values
+from api.serializers import PostSerializer
+from posts.models import Post
+
+
+def drf_path(limit):
+    queryset = PostSerializer.setup_eager_loading(
+        Post.objects.filter(is_published=True)
+    )[:limit]
+    return JSONRenderer().render(PostSerializer(queryset, many=True).data)
+
+
+def fast_path(limit):
+    rows = post_values(Post.objects.filter(is_published=True))[:limit]
+    return ORJSONRenderer().render([post_representation(row) for row in rows])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument(
+        "--limit", type=int, nargs="+", default=[20, 100, 1000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    create_database()
+    populate(args.posts, published_ratio=1)
+
+    print(
+        f"{'строк':>8} {'DRF, мс':>10} {'быстрый, мс':>12} {'ускорение':>10}"
+    )
+    for limit in args.limit:
+        assert drf_path(limit) == fast_path(limit), "Вывод путей различается"
+        timings = {}
+        for name, path in (("drf", drf_path), ("fast", fast_path)):
+            timings[name] = statistics.median(
+                timeit.repeat(
+                    lambda: path(limit), number=1, repeat=args.repeat
+                )
+            )
+        print(
+            f"{limit:>8} {timings['drf'] * 1000:>10.2f} "
+            f"{timings['fast'] * 1000:>12.2f} "
+            f"{timings['drf'] / timings['fast']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
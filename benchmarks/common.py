@@ -0,0 +1,76 @@
+"""Общая настройка Django и наполнение базы для бенчмарков."""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parent.parent / "simple_crud_api")
+)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "simple_crud_api.settings")
+# Бенчмарки отправляют тысячи запросов от одного клиента.
+os.environ.setdefault("THROTTLING", "False")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+User = get_user_model()
+
+SCALE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_scale(value):
+    """Преобразует строку вида 10k, 100k или 1M в число."""
+    value = value.strip().lower()
+    if value[-1] in SCALE_SUFFIXES:
+        return int(float(value[:-1]) * SCALE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+def create_database(name=None):
+    """
+    Создает тестовую базу данных с примененными миграциями.
+    Для SQLite по умолчанию база находится в памяти; имя файла позволяет
+    проверить работу с диском и из нескольких потоков.
+    """
+    if name:
+        connection.settings_dict["TEST"]["NAME"] = name
+    return connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+# Число различных тем в текстах постов: каждая встречается
+# в posts / SEARCH_TOPICS постах и используется в сценариях поиска.
+SEARCH_TOPICS = 1000
+
+
+def populate(posts, users=100, published_ratio=0.9, batch_size=5000):
+    """Наполняет базу синтетическими пользователями и постами."""
+    authors = User.objects.bulk_create(
+        User(username=f"bench_user_{number}") for number in range(users)
+    )
+    published_every = 0
+    if published_ratio < 1:
+        published_every = round(1 / (1 - published_ratio))
+    Post.objects.bulk_create(
+        (
+            Post(
+                name=f"Пост {number}",
+                text=(
+                    f"Текст синтетического поста {number}. " * 20
+                    + f"тема{number % SEARCH_TOPICS}"
+                ),
+                author=authors[number % users],
+                is_published=not (
+                    published_every and number % published_every == 0
+                ),
+            )
+            for number in range(posts)
+        ),
+        batch_size=batch_size,
+    )
+    return authors
@@ -0,0 +1,230 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+
+from api.authentication import CachedTokenAuthentication
+from api.cache import acache_anonymous_get
+from api.conditional import aconditional_get, make_etag
+from api.events import stream_events
+from api.metrics import measure
+from api.pagination import ChangesPagination
+from api.renderers import ORJSONRenderer
+from api.representations import (
+    post_representation,
+    post_representations,
+    post_values,
+    select_fields,
+)
+from api.serializers import PostSerializer
+from api.throttling import check_throttles
+from api.views import (
+    api_posts,
+    api_posts_detail,
+    delete_posts,
+    get_editable_posts,
+    get_write_error,
+    is_drafts_request,
+    post_state,
+    posts_feed,
+    posts_state,
+    update_posts,
+)
+from posts.models import Post, PostChange
+
+
+def render(data, status_code=status.HTTP_200_OK):
+    with measure("render"):
+        content = ORJSONRenderer().render(data)
+    return HttpResponse(
+        content,
+        status=status_code,
+        content_type=ORJSONRenderer.media_type,
+    )
+
+
+async def write_error(request, pk):
+    """Асинхронный вариант write_error_response: 404, 403 или 412."""
+    status_code, message = await sync_to_async(get_write_error)(request, pk)
+    return render({"error": message}, status_code)
+
+
+def async_api_view(methods, schema_view):
+    """
+    Декоратор для асинхронных вью API.
+    Аутентифицирует запрос по токену без перехода в поток (по сессии —
+    в потоке, с проверкой CSRF, как SessionAuthentication), оборачивает
+    его в Request из DRF для разбора тела и превращает исключения DRF
+    в JSON-ответы. Схема OpenAPI берется у синхронного вью schema_view,
+    если оно задано.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return render(
+                    {"detail": f"Метод {request.method} не разрешен"},
+                    status.HTTP_405_METHOD_NOT_ALLOWED,
+                )
+            try:
+                result = await CachedTokenAuthentication().aauthenticate(
+                    request
+                )
+                drf_request = Request(
+                    request,
+                    parsers=[JSONParser(), FormParser(), MultiPartParser()],
+                )
+                # Сессия читается из базы, поэтому проверяется в потоке
+                # и только при наличии cookie сессии.
+                if (
+                    result is None
+                    and settings.SESSION_COOKIE_NAME in request.COOKIES
+                ):
+                    result = await sync_to_async(
+                        SessionAuthentication().authenticate
+                    )(drf_request)
+                drf_request.user = result[0] if result else AnonymousUser()
+                # Счетчики обновляются синхронными методами кэша (сетевой
+                # вызов для Redis или Memcached), поэтому проверка
+                # выполняется в потоке, а не в цикле событий.
+                await sync_to_async(check_throttles)(drf_request)
+                return await view(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                status_code = exc.status_code
+                if isinstance(
+                    exc,
+                    (
+                        exceptions.NotAuthenticated,
+                        exceptions.AuthenticationFailed,
+                    ),
+                ):
+                    status_code = status.HTTP_403_FORBIDDEN
+                if isinstance(exc.detail, (list, dict)):
+                    response = render(exc.detail, status_code)
+                else:
+                    response = render({"detail": exc.detail}, status_code)
+                if getattr(exc, "wait", None):
+                    response.headers["Retry-After"] = str(exc.wait)
+                return response
+
+        wrapper.csrf_exempt = True
+        if schema_view is not None:
+            wrapper.cls = schema_view.cls
+            wrapper.initkwargs = schema_view.initkwargs
+        return wrapper
+
+    return decorator
+
+
+@async_api_view(["GET", "POST"], schema_view=api_posts)
+@aconditional_get(posts_state, skip=is_drafts_request)
+@acache_anonymous_get
+async def aapi_posts(request):
+    """
+    Асинхронная версия api_posts для работы под ASGI.
+    Метод GET возвращает опубликованные посты постранично.
+    Метод POST создает новый пост для авторизованного пользователя.
+    """
+    if request.method == "GET":
+        fields = select_fields(request.query_params)
+        paginator, queryset = posts_feed(request, fields)
+        rows = await paginator.apaginate_queryset(queryset, request)
+        return render(
+            paginator.get_paginated_data(post_representations(rows, fields))
+        )
+
+    if not request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    serializer = PostSerializer(data=request.data)
+    if not serializer.is_valid():
+        return render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+    post = await Post.objects.acreate(
+        author=request.user, **serializer.validated_data
+    )
+    return render(PostSerializer(post).data, status.HTTP_201_CREATED)
+
+
+@async_api_view(
+    ["GET", "PUT", "PATCH", "DELETE"], schema_view=api_posts_detail
+)
+@aconditional_get(post_state)
+@acache_anonymous_get
+async def aapi_posts_detail(request, pk):
+    """
+    Асинхронная версия api_posts_detail для работы под ASGI.
+    Методы PUT, PATCH и DELETE доступны только для автора или администратора.
+    """
+    if request.method == "GET":
+        fields = select_fields(request.query_params)
+        row = await post_values(Post.objects.filter(pk=pk), fields).afirst()
+        if row is None:
+            return render(
+                {"error": "Поста с таким ID не существует"},
+                status.HTTP_404_NOT_FOUND,
+            )
+        with measure("serializer"):
+            data = post_representation(row, fields)
+        return render(data)
+
+    posts = get_editable_posts(request, pk)
+    if request.method == "DELETE":
+        if not await sync_to_async(delete_posts)(posts):
+            return await write_error(request, pk)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+    serializer = PostSerializer(data=request.data, partial=True)
+    if not serializer.is_valid():
+        if not await posts.aexists():
+            return await write_error(request, pk)
+        return render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+    if not await sync_to_async(update_posts)(posts, serializer.validated_data):
+        return await write_error(request, pk)
+
+    try:
+        post = await PostSerializer.setup_eager_loading(Post.objects).aget(
+            pk=pk
+        )
+    except Post.DoesNotExist:
+        return await write_error(request, pk)
+    response = render(PostSerializer(post).data)
+    response.headers["ETag"] = make_etag(
+        post.version, request.build_absolute_uri(), ORJSONRenderer.format
+    )
+    return response
+
+
+@async_api_view(["GET"], schema_view=None)
+async def aapi_posts_events(request):
+    """
+    Поток Server-Sent Events о создании, изменении и удалении постов
+    по мере фиксации транзакций. Идентификатор события — курсор журнала
+    изменений: заголовок Last-Event-ID или параметр since продолжают
+    поток с места обрыва. Работает только под ASGI: под WSGI поток
+    занимал бы поток сервера на все время соединения.
+    """
+    if not isinstance(request._request, ASGIRequest):
+        return render(
+            {"error": "Поток событий доступен только при запуске под ASGI"},
+            status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    paginator = ChangesPagination()
+    encoded = request.headers.get("Last-Event-ID") or (
+        request.query_params.get(paginator.cursor_query_param)
+    )
+    position = None
+    if encoded:
+        _, position = paginator.parse_cursor(encoded, PostChange)
+    response = StreamingHttpResponse(
+        stream_events(position), content_type="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
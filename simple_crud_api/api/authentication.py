@@ -0,0 +1,100 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+
+def get_token_cache_key(key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"auth:token:{digest}", digest
+
+
+def forget_token(key):
+    """Удаляет токен из кэша аутентификации."""
+    cache.delete(get_token_cache_key(key)[0])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Аутентификация по токену с кэшированием выданных токенов.
+    Кэш адресуется SHA-256 от токена, а совпадение проверяется
+    hmac.compare_digest, поэтому проверка выполняется за постоянное время
+    и в горячем пути не обращается ни к базе, ни к хешеру паролей.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key, digest = get_token_cache_key(key)
+        cached = self.check_cached(cache.get(cache_key), digest)
+        if cached is not None:
+            return cached
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related("user").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed("Неверный токен")
+        self.check_token(token, key)
+
+        cache.set(
+            cache_key,
+            (token.user, token, digest),
+            settings.AUTH_TOKEN_CACHE_TIMEOUT,
+        )
+        return token.user, token
+
+    async def aauthenticate(self, request):
+        """Асинхронный вариант authenticate для async-вью."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Неверный заголовок токена")
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Неверный заголовок токена")
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        cache_key, digest = get_token_cache_key(key)
+        cached = self.check_cached(await cache.aget(cache_key), digest)
+        if cached is not None:
+            return cached
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related("user").aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed("Неверный токен")
+        self.check_token(token, key)
+
+        await cache.aset(
+            cache_key,
+            (token.user, token, digest),
+            settings.AUTH_TOKEN_CACHE_TIMEOUT,
+        )
+        return token.user, token
+
+    @staticmethod
+    def check_cached(cached, digest):
+        if cached is None:
+            return None
+        user, token, cached_digest = cached
+        if not hmac.compare_digest(digest, cached_digest):
+            return None
+        return user, token
+
+    @staticmethod
+    def check_token(token, key):
+        if not hmac.compare_digest(token.key, key):
+            raise exceptions.AuthenticationFailed("Неверный токен")
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                "Пользователь неактивен или удален"
+            )
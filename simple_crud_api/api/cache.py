@@ -0,0 +1,127 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.routers import read_from_replica
+
+GENERATION_KEY = "posts:generation"
+BUMPED_KEY = "posts:generation:bumped"
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 1, None)
+    cache.set(BUMPED_KEY, time.time(), None)
+
+
+def can_cache_reads():
+    """
+    Можно ли кэшировать данные, прочитанные в текущем запросе.
+    Сразу после записи реплика может отставать, и прочитанные из нее
+    данные попали бы в кэш под новым поколением.
+    """
+    if not read_from_replica.get():
+        return True
+    bumped = cache.get(BUMPED_KEY, 0)
+    return time.time() - bumped >= settings.REPLICA_STICKY_SECONDS
+
+
+def invalidate_posts_cache():
+    """
+    Инвалидирует все закэшированные ответы после фиксации транзакции,
+    чтобы параллельный читатель не закэшировал данные до записи
+    под новым поколением.
+    """
+    transaction.on_commit(bump_generation)
+
+
+def get_response_cache_key(request, rendered=False):
+    """
+    Ключ кэша ответа. Синхронные вью кэшируют данные ответа, а
+    асинхронные — готовое тело (rendered), поэтому ключи различаются.
+    """
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    kind = "content" if rendered else "response"
+    return f"posts:{kind}:{get_generation()}:{url}"
+
+
+def get_cached_content(request):
+    key = get_response_cache_key(request, rendered=True)
+    return key, cache.get(key)
+
+
+def set_cached_content(key, response):
+    if can_cache_reads():
+        cache.set(
+            key,
+            (response.content, response["Content-Type"]),
+            settings.POSTS_CACHE_TIMEOUT,
+        )
+
+
+def cache_anonymous_get(view):
+    """
+    Кэширует сериализованные данные ответов на анонимные GET-запросы.
+    Ключ включает номер поколения, который увеличивается при любой
+    записи постов, поэтому устаревшие данные не отдаются.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        key = get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and can_cache_reads():
+            cache.set(key, response.data, settings.POSTS_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
+
+
+def acache_anonymous_get(view):
+    """
+    Асинхронный вариант cache_anonymous_get для async-вью, которые сами
+    рендерят ответ: кэшируется готовое тело ответа. Обращения к кэшу
+    выполняются в потоке, чтобы сетевой кэш не блокировал цикл событий.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return await view(request, *args, **kwargs)
+
+        key, cached = await sync_to_async(get_cached_content)(request)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = await view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await sync_to_async(set_cached_content)(key, response)
+        return response
+
+    return wrapper
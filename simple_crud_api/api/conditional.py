@@ -0,0 +1,154 @@
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+
+from api.cache import can_cache_reads, get_generation
+from api.renderers import ORJSONRenderer
+
+
+def make_etag(version, *parts):
+    """
+    ETag вида "<версия>-<хэш>": хэш различает представления ресурса
+    (адрес, формат), а версия позволяет проверить If-Match при записи.
+    """
+    digest = hashlib.md5(
+        ":".join(map(str, (version, *parts))).encode()
+    ).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def get_if_match_versions(request):
+    """
+    Возвращает версии ресурса из заголовка If-Match или None, если
+    предусловия нет (заголовка нет или он равен «*»).
+    Слабые ETag принимаются: их выдает CompressionMiddleware для сжатых
+    ответов, а версия в них та же.
+    """
+    header = request.headers.get("If-Match")
+    if header is None:
+        return None
+    etags = parse_etags(header)
+    if "*" in etags:
+        return None
+    versions = []
+    for etag in etags:
+        version, _, _ = etag.removeprefix("W/").strip('"').partition("-")
+        if version.isdigit():
+            versions.append(int(version))
+    return versions
+
+
+def get_state(state_func, request, args, kwargs):
+    """
+    Состояние ресурса из кэша или от state_func; None, если ресурса нет.
+    Результат кэшируется по аргументам вью до следующей записи постов.
+    """
+    key = "posts:state:{}:{}:{}".format(
+        get_generation(),
+        state_func.__name__,
+        hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest(),
+    )
+    state = cache.get(key)
+    if state is None:
+        state = state_func(request, *args, **kwargs)
+        if state is not None and can_cache_reads():
+            cache.set(key, state, settings.POSTS_CACHE_TIMEOUT)
+    return state
+
+
+def get_validators(request, state, renderer_format):
+    """Возвращает ETag и Last-Modified (timestamp или None) ресурса."""
+    version, modified = state
+    etag = make_etag(version, request.build_absolute_uri(), renderer_format)
+    last_modified = int(modified.timestamp()) if modified else None
+    return etag, last_modified
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code in (
+        status.HTTP_200_OK,
+        status.HTTP_304_NOT_MODIFIED,
+    ):
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def conditional_get(state_func, skip=None):
+    """
+    Добавляет к GET-ответам заголовки ETag и Last-Modified и отвечает
+    304 на If-None-Match / If-Modified-Since, не вызывая вью.
+    state_func(request, *args, **kwargs) возвращает кортеж
+    (версия данных, время изменения) или None, если ресурса нет;
+    версия попадает в ETag и не должна содержать пробелов и кавычек.
+    Результат state_func кэшируется по аргументам вью до следующей записи
+    постов, поэтому state_func не должна зависеть от параметров запроса
+    и пользователя. Запросы, для которых skip(request) истинно, передаются
+    во вью без условной обработки и без обращения к кэшу.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or (
+                skip is not None and skip(request)
+            ):
+                return view(request, *args, **kwargs)
+
+            state = get_state(state_func, request, args, kwargs)
+            if state is None:
+                return view(request, *args, **kwargs)
+            etag, last_modified = get_validators(
+                request, state, request.accepted_renderer.format
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
+
+
+def aconditional_get(state_func, skip=None):
+    """
+    Асинхронный вариант conditional_get для async-вью, которые отдают
+    ответ в формате ORJSONRenderer. Кэш и state_func вызываются в потоке.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or (
+                skip is not None and skip(request)
+            ):
+                return await view(request, *args, **kwargs)
+
+            state = await sync_to_async(get_state)(
+                state_func, request, args, kwargs
+            )
+            if state is None:
+                return await view(request, *args, **kwargs)
+            etag, last_modified = get_validators(
+                request, state, ORJSONRenderer.format
+            )
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
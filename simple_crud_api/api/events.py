@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from api.pagination import ChangesPagination
+from api.renderers import ORJSONRenderer
+from api.representations import (
+    CHANGE_VALUES,
+    change_representation,
+    changed_posts,
+)
+from posts.changes import committed_changes
+from posts.models import PostChange
+
+logger = logging.getLogger(__name__)
+
+# Через сколько миллисекунд EventSource переподключается после закрытия
+# потока.
+RETRY_MS = 1000
+
+
+class Subscription:
+    """
+    Ограниченный буфер событий одного клиента потока.
+    Буфер хранит не больше EVENTS_BUFFER_SIZE событий и
+    EVENTS_BUFFER_BYTES байт. При переполнении он очищается и помечается
+    отставшим: клиент дочитывает пропущенное из журнала изменений,
+    поэтому медленный клиент не копит события в памяти.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.events = deque()
+        self.size = 0
+        self.lagged = False
+        self.ready = asyncio.Event()
+
+    def put(self, events):
+        """Добавляет события; вызывается в цикле событий клиента."""
+        if self.lagged:
+            return
+        for position, frame in events:
+            if (
+                len(self.events) >= settings.EVENTS_BUFFER_SIZE
+                or self.size + len(frame) > settings.EVENTS_BUFFER_BYTES
+            ):
+                self.events.clear()
+                self.size = 0
+                self.lagged = True
+                break
+            self.events.append((position, frame))
+            self.size += len(frame)
+        self.ready.set()
+
+    def drain(self):
+        """Забирает накопленные события и признак отставания."""
+        events, lagged = list(self.events), self.lagged
+        self.events.clear()
+        self.size = 0
+        self.lagged = False
+        self.ready.clear()
+        return events, lagged
+
+
+class BaseBroker:
+    """
+    Интерфейс рассылки событий подписчикам потока.
+    Бэкенд выбирается настройкой EVENTS_BROKER; бэкенд для нескольких
+    процессов передает события через внешний канал и вызывает
+    Subscription.put в цикле событий локальных подписчиков.
+    """
+
+    def subscribe(self, subscription):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def has_subscribers(self):
+        raise NotImplementedError
+
+    def publish(self, events):
+        """Рассылает список пар (позиция в журнале, кадр SSE)."""
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    """
+    Рассылка событий подписчикам текущего процесса. Публиковать можно
+    из любого потока: события передаются в цикл событий подписчика.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def subscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self.subscriptions)
+
+    def publish(self, events):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, events
+                )
+            except RuntimeError:
+                # Цикл событий подписчика уже закрыт.
+                self.unsubscribe(subscription)
+
+
+def changes_after(position, limit):
+    """Запрос записей журнала строго после позиции (txid, id)."""
+    paginator = ChangesPagination()
+    queryset = committed_changes(
+        PostChange.objects.values(*CHANGE_VALUES)
+    ).order_by(*paginator.ordering)
+    if position is not None:
+        queryset = queryset.filter(
+            paginator.get_keyset_filter(position, False)
+        )
+    return queryset[:limit]
+
+
+def render_events(changes, posts):
+    """Строит пары (позиция, кадр SSE) для записей журнала."""
+    paginator = ChangesPagination()
+    renderer = ORJSONRenderer()
+    events = []
+    for change in changes:
+        position = paginator.get_position(change)
+        data = renderer.render(change_representation(change, posts))
+        frame = (
+            f"id: {paginator.make_cursor(position)}\n"
+            f"event: {change['action']}\n"
+            "data: "
+        ).encode()
+        events.append((position, frame + data + b"\n\n"))
+    return events
+
+
+def read_events(position, limit):
+    changes = list(changes_after(position, limit))
+    posts = {row["id"]: row for row in changed_posts(changes)}
+    return render_events(changes, posts)
+
+
+async def aread_events(position, limit):
+    changes = [row async for row in changes_after(position, limit)]
+    posts = {row["id"]: row async for row in changed_posts(changes)}
+    return render_events(changes, posts)
+
+
+def read_head():
+    """Позиция последней записи журнала или None для пустого журнала."""
+    return (
+        committed_changes(PostChange.objects.values_list("txid", "id"))
+        .order_by("-txid", "-id")
+        .first()
+    )
+
+
+class ChangesPublisher:
+    """
+    Читает новые записи журнала изменений и рассылает их подписчикам.
+    Журнал читает одна фоновая задача процесса раз в
+    EVENTS_POLL_INTERVAL секунд, пока есть подписчики, поэтому каждое
+    изменение читается из базы один раз, а не каждым клиентом, и запись
+    постов не тратит время на рассылку. Опрос подбирает и изменения,
+    зафиксированные другими процессами.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.lock = threading.Lock()
+        self.active = False
+        self.position = None
+        self.task = None
+
+    def activate(self):
+        if not self.active:
+            self.position = read_head()
+            self.active = True
+
+    def start(self):
+        """Начинает публикацию с конца журнала для нового подписчика."""
+        with self.lock:
+            self.activate()
+
+    def publish(self):
+        """Публикует записи журнала после последней опубликованной."""
+        with self.lock:
+            if not self.broker.has_subscribers():
+                self.active = False
+                return
+            self.activate()
+            batch_size = settings.EVENTS_BATCH_SIZE
+            while True:
+                events = read_events(self.position, batch_size)
+                if events:
+                    self.position = events[-1][0]
+                    self.broker.publish(events)
+                if len(events) < batch_size:
+                    break
+
+    async def poll(self):
+        while self.broker.has_subscribers():
+            try:
+                await sync_to_async(self.publish)()
+            except Exception:
+                logger.warning("Не удалось прочитать журнал", exc_info=True)
+            await asyncio.sleep(settings.EVENTS_POLL_INTERVAL)
+
+    def ensure_polling(self):
+        """Запускает задачу опроса в текущем цикле событий, если ее нет."""
+        if (
+            self.task is None
+            or self.task.done()
+            or self.task.get_loop().is_closed()
+        ):
+            self.task = asyncio.create_task(self.poll())
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.EVENTS_BROKER)()
+
+
+@lru_cache(maxsize=None)
+def get_publisher():
+    return ChangesPublisher(get_broker())
+
+
+async def stream_events(position):
+    """
+    Отдает кадры SSE: сначала дочитывает журнал изменений после
+    позиции, затем события из буфера подписки, а после переполнения
+    буфера снова дочитывает журнал. Поток закрывается через
+    EVENTS_MAX_DURATION секунд, и клиент переподключается
+    с Last-Event-ID, поэтому оборванные соединения не копятся.
+    """
+    broker, publisher = get_broker(), get_publisher()
+    subscription = Subscription()
+    broker.subscribe(subscription)
+    try:
+        await sync_to_async(publisher.start)()
+        publisher.ensure_polling()
+        if position is None:
+            position = await sync_to_async(read_head)()
+        yield f"retry: {RETRY_MS}\n\n".encode()
+
+        batch_size = settings.EVENTS_BATCH_SIZE
+        deadline = time.monotonic() + settings.EVENTS_MAX_DURATION
+        lagged = True
+        while True:
+            while lagged:
+                events = await aread_events(position, batch_size)
+                for position, frame in events:
+                    yield frame
+                lagged = len(events) == batch_size
+
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+            try:
+                await asyncio.wait_for(
+                    subscription.ready.wait(),
+                    min(timeout, settings.EVENTS_HEARTBEAT),
+                )
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+
+            events, lagged = subscription.drain()
+            if lagged:
+                continue
+            for event_position, frame in events:
+                if position is None or event_position > position:
+                    position = event_position
+                    yield frame
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,69 @@
+import csv
+
+from api.renderers import NDJSONRenderer
+from api.representations import post_representation, post_values
+
+EXPORT_FIELDS = (
+    "id",
+    "author",
+    "name",
+    "text",
+    "created",
+    "updated",
+    "is_published",
+    "version",
+)
+
+
+class Echo:
+    """Псевдо-буфер, возвращающий записанную строку для csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size):
+    """
+    Построчно читает посты через values() и iterator(), не создавая
+    объектов моделей и не загружая всю таблицу в память.
+    """
+    rows = post_values(queryset.order_by("id")).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield post_representation(row)
+
+
+async def aexport_rows(queryset, chunk_size):
+    """
+    Асинхронный вариант export_rows для ASGI: aiterator() читает
+    пакеты по chunk_size строк в потоке. Синхронный генератор Django
+    под ASGI собирает в список целиком до отправки первого байта.
+    """
+    rows = post_values(queryset.order_by("id")).aiterator(
+        chunk_size=chunk_size
+    )
+    async for row in rows:
+        yield post_representation(row)
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield NDJSONRenderer.render_row(row)
+
+
+async def astream_ndjson(rows):
+    async for row in rows:
+        yield NDJSONRenderer.render_row(row)
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+async def astream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    async for row in rows:
+        yield writer.writerow(row.values())
@@ -0,0 +1,82 @@
+from rest_framework import exceptions, serializers
+
+# Допустимые значения параметра ordering и соответствующие им поля
+# keyset-пагинации. Каждую сортировку поддерживает индекс: для ленты
+# created — post_published_feed_idx, updated — post_published_updated_idx,
+# с фильтром author и для черновиков — post_author_created_idx и
+# post_author_updated_idx. Диапазон по created нельзя совместить
+# с сортировкой по updated в одном индексе, поэтому фильтр по дате
+# допускает только сортировку по created.
+ORDERINGS = {
+    "-created": ("-created", "-id"),
+    "created": ("created", "id"),
+    "-updated": ("-updated", "-id"),
+    "updated": ("updated", "id"),
+}
+
+
+class PostFilterSerializer(serializers.Serializer):
+    """Параметры фильтрации и сортировки списка постов."""
+
+    author = serializers.CharField(
+        required=False, help_text="Имя пользователя автора"
+    )
+    created__gte = serializers.DateTimeField(
+        required=False, help_text="Созданы не раньше указанного времени"
+    )
+    created__lte = serializers.DateTimeField(
+        required=False, help_text="Созданы не позже указанного времени"
+    )
+    is_published = serializers.BooleanField(
+        required=False,
+        default=True,
+        help_text=(
+            "false — черновики текущего пользователя (требует авторизации)"
+        ),
+    )
+    ordering = serializers.ChoiceField(
+        choices=list(ORDERINGS),
+        required=False,
+        default="-created",
+        help_text="Порядок сортировки",
+    )
+
+    def validate(self, attrs):
+        if ORDERINGS[attrs["ordering"]][0].lstrip("-") != "created" and (
+            "created__gte" in attrs or "created__lte" in attrs
+        ):
+            raise serializers.ValidationError(
+                {
+                    "ordering": [
+                        "С фильтром по дате создания доступна только "
+                        "сортировка по дате создания"
+                    ]
+                }
+            )
+        return attrs
+
+
+def requests_drafts(params):
+    """Запрошены ли черновики текущего пользователя."""
+    return params.get("is_published") in serializers.BooleanField.FALSE_VALUES
+
+
+def filter_posts(queryset, params, user):
+    """
+    Применяет к запросу постов фильтры из параметров запроса params.
+    Возвращает отфильтрованный запрос и поля сортировки для пагинации.
+    """
+    serializer = PostFilterSerializer(data=dict(params.items()))
+    serializer.is_valid(raise_exception=True)
+    filters = dict(serializer.validated_data)
+    ordering = ORDERINGS[filters.pop("ordering")]
+
+    if not filters.pop("is_published"):
+        if not user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        queryset = queryset.filter(author=user, is_published=False)
+    else:
+        queryset = queryset.filter(is_published=True)
+    if "author" in filters:
+        filters["author__username"] = filters.pop("author")
+    return queryset.filter(**filters), ordering
@@ -0,0 +1,95 @@
+from itertools import product
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from api.filters import ORDERINGS, filter_posts
+from api.pagination import KeysetPagination
+from api.representations import post_values
+from api.serializers import PostSerializer
+from posts.models import Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Выводит планы выполнения (EXPLAIN) запросов, которые выполняют
+    эндпоинты API, чтобы убедиться в использовании индексов.
+    """
+
+    help = "Выводит EXPLAIN для запросов эндпоинтов постов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Выполнить EXPLAIN ANALYZE (только PostgreSQL)",
+        )
+
+    def get_querysets(self):
+        paginator = KeysetPagination()
+        published = PostSerializer.setup_eager_loading(
+            Post.objects.filter(is_published=True)
+        ).order_by(*paginator.ordering)
+        position = (timezone.now(), 0)
+        author_id = Post.objects.values_list("author_id", flat=True).first()
+        return {
+            "api_posts: первая страница": published[: settings.PAGE_SIZE + 1],
+            "api_posts: страница по курсору": published.filter(
+                paginator.get_keyset_filter(position, reverse=False)
+            )[: settings.PAGE_SIZE + 1],
+            "api_posts_detail": PostSerializer.setup_eager_loading(
+                Post.objects.filter(pk=0)
+            ),
+            "посты автора": Post.objects.filter(
+                author_id=author_id or 0
+            ).order_by("-created")[: settings.PAGE_SIZE + 1],
+            **self.get_filtered_querysets(),
+        }
+
+    def get_filtered_querysets(self):
+        """
+        Запросы api_posts для каждой допустимой комбинации фильтров
+        и сортировки: опубликованные посты или черновики, с фильтром по
+        автору или без, с фильтром по дате создания или без.
+        """
+        author = User.objects.order_by("pk").first() or User(pk=0)
+        now = timezone.now().isoformat()
+        filters = {
+            "черновики": {"is_published": "false"},
+            "автор": {"author": author.get_username()},
+            "дата": {"created__gte": now, "created__lte": now},
+        }
+        querysets = {}
+        for names in product(*([(), (name,)] for name in filters)):
+            names = sum(names, ())
+            for ordering in ORDERINGS:
+                params = {"ordering": ordering}
+                for name in names:
+                    params.update(filters[name])
+                try:
+                    queryset, keys = filter_posts(
+                        Post.objects.all(), params, author
+                    )
+                except ValidationError:
+                    continue
+                title = ", ".join((*names, ordering))
+                querysets[f"api_posts: {title}"] = post_values(
+                    queryset.order_by(*keys)
+                )[: settings.PAGE_SIZE + 1]
+        return querysets
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options["analyze"] = True
+        for title, queryset in self.get_querysets().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
@@ -0,0 +1,166 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS = {
+    "api_request_duration_seconds": (
+        "Время обработки запроса",
+        DURATION_BUCKETS,
+    ),
+    "api_db_queries": ("Число SQL-запросов на запрос", QUERY_BUCKETS),
+    "api_db_duration_seconds": ("Время SQL-запросов", DURATION_BUCKETS),
+    "api_serializer_duration_seconds": (
+        "Время сериализации",
+        DURATION_BUCKETS,
+    ),
+    "api_render_duration_seconds": ("Время рендеринга", DURATION_BUCKETS),
+    "api_response_size_bytes": ("Размер ответа", SIZE_BUCKETS),
+}
+
+request_stats = contextvars.ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """Показатели одного запроса, накапливаемые по мере его обработки."""
+
+    __slots__ = ("queries", "db", "serializer", "render")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.render = 0.0
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """
+    Агрегированные гистограммы в памяти процесса с выводом в текстовом
+    формате Prometheus.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.histograms = {}
+        self.requests = defaultdict(int)
+
+    def observe(self, view, method, status_code, values):
+        with self.lock:
+            self.requests[(view, method, status_code)] += 1
+            for name, value in values.items():
+                key = (name, view, method)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(HISTOGRAMS[name][1])
+                    self.histograms[key] = histogram
+                histogram.observe(value)
+
+    def render(self):
+        with self.lock:
+            lines = [
+                "# HELP api_requests_total Число обработанных запросов",
+                "# TYPE api_requests_total counter",
+            ]
+            for (view, method, status_code), total in sorted(
+                self.requests.items()
+            ):
+                lines.append(
+                    f'api_requests_total{{view="{view}",method="{method}",'
+                    f'status="{status_code}"}} {total}'
+                )
+            for name, (description, _) in HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view, method), histogram in sorted(
+                    self.histograms.items()
+                ):
+                    if metric == name:
+                        lines.extend(
+                            self.render_histogram(
+                                name, view, method, histogram
+                            )
+                        )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def render_histogram(name, view, method, histogram):
+        labels = f'view="{view}",method="{method}"'
+        cumulative = 0
+        for bound, count in zip(
+            histogram.buckets + ("+Inf",), histogram.counts
+        ):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {histogram.sum}"
+        yield f"{name}_count{{{labels}}} {histogram.count}"
+
+
+registry = Registry()
+
+
+@contextmanager
+def measure(stage):
+    """Добавляет время выполнения блока к этапу текущего запроса."""
+    stats = request_stats.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(
+            stats,
+            stage,
+            getattr(stats, stage) + time.perf_counter() - started,
+        )
+
+
+def query_timer(execute, sql, params, many, context):
+    """Обертка выполнения SQL, считающая запросы и их время."""
+    stats = request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db += time.perf_counter() - started
+        stats.queries += 1
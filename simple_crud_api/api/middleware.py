@@ -0,0 +1,300 @@
+import gzip
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence
+
+from api.metrics import RequestStats, registry, request_stats
+from api.routers import read_from_replica
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/vnd.oai.openapi",
+    "text/",
+)
+
+
+class PerformanceMiddleware:
+    """
+    Замеряет для каждого запроса общее время, число и время SQL-запросов,
+    время сериализации и рендеринга, размер ответа. Отдает их в заголовке
+    Server-Timing и агрегирует в гистограммы по имени URL.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    def process_template_response(self, request, response):
+        stats = request_stats.get()
+        if stats is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                stats.render += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def start():
+        stats = RequestStats()
+        return stats, request_stats.set(stats), time.perf_counter()
+
+    @staticmethod
+    def finish(request, response, stats, started):
+        total = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+
+        values = {
+            "api_request_duration_seconds": total,
+            "api_db_queries": stats.queries,
+            "api_db_duration_seconds": stats.db,
+            "api_serializer_duration_seconds": stats.serializer,
+            "api_render_duration_seconds": stats.render,
+        }
+        if not response.streaming:
+            values["api_response_size_bytes"] = len(response.content)
+        registry.observe(view, request.method, response.status_code, values)
+
+        response.headers["Server-Timing"] = ", ".join(
+            (
+                f"total;dur={total * 1000:.2f}",
+                f'db;dur={stats.db * 1000:.2f};desc="{stats.queries} queries"',
+                f"serializer;dur={stats.serializer * 1000:.2f}",
+                f"render;dur={stats.render * 1000:.2f}",
+            )
+        )
+        return response
+
+
+def parse_accept_encoding(header):
+    """Возвращает кодировки из Accept-Encoding с ненулевым весом."""
+    encodings = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = params.strip()
+        if weight.startswith("q="):
+            try:
+                if float(weight[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+def compress_brotli_sequence(sequence, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы API через brotli (если установлен пакет brotli) или
+    gzip в зависимости от заголовка Accept-Encoding. Ответы меньше
+    COMPRESSION_MIN_SIZE байт и несжимаемые типы отдаются как есть.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        content_type = response.get("Content-Type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        # Асинхронные потоки (события в реальном времени) не сжимаются:
+        # сжатие буферизует данные и задерживает их доставку.
+        if response.streaming and response.is_async:
+            return response
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encodings = parse_accept_encoding(
+            request.headers.get("Accept-Encoding", "")
+        )
+        if brotli is not None and "br" in encodings:
+            encoding = "br"
+        elif "gzip" in encodings:
+            encoding = "gzip"
+        else:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_sequence(
+                response.streaming_content, encoding
+            )
+            del response.headers["Content-Length"]
+        else:
+            compressed = self.compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # Сжатое тело отличается от исходного побайтно, поэтому сильный
+        # ETag превращается в слабый, как в GZipMiddleware из Django.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    @staticmethod
+    def compress(content, encoding):
+        if encoding == "br":
+            return brotli.compress(
+                content, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        return gzip.compress(
+            content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0
+        )
+
+    @staticmethod
+    def compress_sequence(sequence, encoding):
+        if encoding == "br":
+            return compress_brotli_sequence(
+                sequence, settings.COMPRESSION_BROTLI_QUALITY
+            )
+        return compress_sequence(sequence)
+
+
+class RateLimitHeadersMiddleware(MiddlewareMixin):
+    """
+    Добавляет к ответу заголовки RateLimit-Limit, RateLimit-Remaining
+    и RateLimit-Reset по самому строгому из ограничений частоты,
+    примененных к запросу.
+    """
+
+    def process_response(self, request, response):
+        rate_limit = getattr(request, "rate_limit", None)
+        if rate_limit is not None:
+            remaining, limit, reset = rate_limit
+            response.headers["RateLimit-Limit"] = str(limit)
+            response.headers["RateLimit-Remaining"] = str(remaining)
+            response.headers["RateLimit-Reset"] = str(reset)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение из реплик для запросов безопасными методами.
+    После записи клиент (по заголовку Authorization или cookie сессии)
+    читает из основной базы еще REPLICA_STICKY_SECONDS секунд, чтобы
+    видеть свои изменения, пока реплики догоняют основную базу.
+    Отметки о записи хранятся в кэше REPLICA_STICKY_CACHE, общем для
+    всех процессов.
+    """
+
+    sync_capable = True
+    async_capable = True
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        sticky_key = self.get_sticky_key(request)
+        token = read_from_replica.set(self.use_replica(request, sticky_key))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+        self.remember_write(request, sticky_key)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+        sticky_key = self.get_sticky_key(request)
+        token = read_from_replica.set(
+            await self.ause_replica(request, sticky_key)
+        )
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+        await self.aremember_write(request, sticky_key)
+        return response
+
+    @staticmethod
+    def get_sticky_key(request):
+        credentials = request.headers.get("Authorization") or (
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        )
+        if not credentials:
+            return None
+        digest = hashlib.sha256(credentials.encode()).hexdigest()
+        return f"db:sticky:{digest}"
+
+    def use_replica(self, request, sticky_key):
+        if request.method not in self.safe_methods:
+            return False
+        sticky_cache = caches[settings.REPLICA_STICKY_CACHE]
+        return sticky_key is None or sticky_cache.get(sticky_key) is None
+
+    def remember_write(self, request, sticky_key):
+        if sticky_key is not None and request.method not in self.safe_methods:
+            caches[settings.REPLICA_STICKY_CACHE].set(
+                sticky_key, True, settings.REPLICA_STICKY_SECONDS
+            )
+
+    async def ause_replica(self, request, sticky_key):
+        if request.method not in self.safe_methods:
+            return False
+        sticky_cache = caches[settings.REPLICA_STICKY_CACHE]
+        return (
+            sticky_key is None or await sticky_cache.aget(sticky_key) is None
+        )
+
+    async def aremember_write(self, request, sticky_key):
+        if sticky_key is not None and request.method not in self.safe_methods:
+            await caches[settings.REPLICA_STICKY_CACHE].aset(
+                sticky_key, True, settings.REPLICA_STICKY_SECONDS
+            )
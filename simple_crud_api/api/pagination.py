@@ -0,0 +1,227 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация по набору полей сортировки.
+    Курсор хранит значения полей сортировки последней (или первой)
+    записи страницы, поэтому стоимость запроса страницы не зависит
+    от глубины прокрутки, в отличие от OFFSET.
+    """
+
+    ordering = ("-created", "-id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Неверный курсор"
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.PAGE_SIZE
+        if page_size <= 0:
+            return settings.PAGE_SIZE
+        return min(page_size, settings.MAX_PAGE_SIZE)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """Строит запрос страницы с одной лишней записью."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+
+        reverse, position = self.cursor or (False, None)
+        queryset = queryset.order_by(*self.get_ordering(reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        reverse, position = self.cursor or (False, None)
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.page = results
+        return results
+
+    def get_ordering(self, reverse=False):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Строит условие «строго после позиции» для составного ключа:
+        a <= x AND ((a < x) OR (a = x AND b < y) OR ...).
+        Избыточное условие по первому полю позволяет СУБД начать
+        чтение индекса сразу с нужной позиции.
+        """
+        ordering = self.get_ordering(reverse)
+        keyset_filter = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & (
+            keyset_filter
+        )
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            return tuple(obj[field.lstrip("-")] for field in self.ordering)
+        return tuple(
+            getattr(obj, field.lstrip("-")) for field in self.ordering
+        )
+
+    @staticmethod
+    def make_cursor(position, reverse=False):
+        payload = {
+            "r": int(reverse),
+            "p": [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in position
+            ],
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+
+    def encode_cursor(self, position, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.make_cursor(position, reverse)
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        return self.parse_cursor(encoded, model)
+
+    def parse_cursor(self, encoded, model):
+        """Разбирает курсор в пару (reverse, position) или отдает 404."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(payload, dict):
+                raise ValueError
+            reverse = bool(payload["r"])
+            values = payload["p"]
+            if not isinstance(values, list) or len(values) != len(
+                self.ordering
+            ):
+                raise ValueError
+            position = tuple(
+                self.to_python(model, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, values)
+            )
+            # to_python(None) возвращает None, а сравнение с NULL
+            # в условии keyset-фильтра недопустимо.
+            if None in position:
+                raise ValueError
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def to_python(self, model, name, value):
+        """Приводит значение из курсора к типу поля сортировки."""
+        return model._meta.get_field(name).to_python(value)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_data(self, data):
+        return OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class SearchPagination(KeysetPagination):
+    """
+    Keyset-пагинация результатов полнотекстового поиска:
+    по релевантности (поле rank), при равенстве — от новых постов к старым.
+    """
+
+    ordering = ("rank", "-id")
+
+    def to_python(self, model, name, value):
+        if name == "rank":
+            return float(value)
+        return super().to_python(model, name, value)
+
+
+class ChangesPagination(KeysetPagination):
+    """
+    Постраничное чтение журнала изменений постов начиная с курсора since.
+    Курсор отдается и на последней странице, чтобы клиент мог запросить
+    следующие изменения позже.
+    """
+
+    ordering = ("txid", "id")
+    cursor_query_param = "since"
+
+    def get_paginated_data(self, data):
+        cursor = self.request.query_params.get(self.cursor_query_param)
+        if self.page:
+            cursor = self.make_cursor(self.get_position(self.page[-1]))
+        return OrderedDict(
+            [
+                ("cursor", cursor),
+                ("has_more", self.has_next),
+                ("results", data),
+            ]
+        )
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Рендерер JSON Lines: один JSON-объект на строку."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return "".join(self.render_row(row) for row in rows).encode()
+
+    @staticmethod
+    def render_row(row):
+        return json.dumps(row, ensure_ascii=False) + "\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """Рендерер CSV с заголовком из ключей первой строки."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not data:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(rows[0].keys())
+        writer.writerows(row.values() for row in rows)
+        return buffer.getvalue().encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на основе orjson.
+    Вывод побайтно совпадает с JSONRenderer из DRF в компактном режиме;
+    для ответов с отступами используется стандартная реализация.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        return (
+            orjson.dumps(data, default=self.encoder_class().default)
+            .replace(b"\xe2\x80\xa8", b"\\u2028")
+            .replace(b"\xe2\x80\xa9", b"\\u2029")
+        )
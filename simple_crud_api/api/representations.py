@@ -0,0 +1,135 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.metrics import measure
+from posts.models import Post
+
+# Поля представления поста и столбцы values(), из которых они берутся.
+POST_FIELDS = {
+    "id": "id",
+    "author": "author__username",
+    "name": "name",
+    "text": "text",
+    "created": "created",
+    "updated": "updated",
+    "is_published": "is_published",
+    "version": "version",
+}
+POST_VALUES = tuple(POST_FIELDS.values())
+DATETIME_FIELDS = ("created", "updated")
+# Столбцы записи журнала изменений: ключ курсора и поля представления.
+CHANGE_VALUES = ("id", "txid", "post_id", "action", "version", "changed")
+
+
+def format_datetime(value):
+    """Форматирует дату так же, как DateTimeField из DRF."""
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def parse_field_names(value, param):
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in POST_FIELDS]
+    if unknown:
+        raise serializers.ValidationError(
+            {param: [f"Неизвестные поля: {', '.join(unknown)}"]}
+        )
+    return set(names)
+
+
+def select_fields(params):
+    """
+    Возвращает поля представления, выбранные параметрами fields и omit,
+    в порядке PostSerializer или None, если нужны все поля.
+    Пустой выбор считается ошибкой запроса.
+    """
+    fields = params.get("fields")
+    omit = params.get("omit")
+    if fields is None and omit is None:
+        return None
+    selected = set(POST_FIELDS)
+    if fields is not None:
+        selected = parse_field_names(fields, "fields")
+    if omit is not None:
+        selected -= parse_field_names(omit, "omit")
+    if not selected:
+        param = "fields" if omit is None else "omit"
+        raise serializers.ValidationError(
+            {param: ["Не выбрано ни одного поля"]}
+        )
+    return tuple(field for field in POST_FIELDS if field in selected)
+
+
+def post_values(queryset, fields=None, extra=()):
+    """
+    Запрашивает только столбцы, нужные для представления поста
+    с полями fields, и дополнительные столбцы extra (например, поля
+    сортировки для пагинации).
+    """
+    if fields is None:
+        columns = POST_VALUES
+    else:
+        columns = [POST_FIELDS[field] for field in fields]
+    return queryset.values(*dict.fromkeys((*columns, *extra)))
+
+
+def post_representation(row, fields=None):
+    """
+    Строит представление поста из строки values() без полей и
+    OrderedDict сериализатора. Ключи и форматы совпадают с PostSerializer.
+    """
+    if fields is not None:
+        return {
+            field: (
+                format_datetime(row[POST_FIELDS[field]])
+                if field in DATETIME_FIELDS
+                else row[POST_FIELDS[field]]
+            )
+            for field in fields
+        }
+    return {
+        "id": row["id"],
+        "author": row["author__username"],
+        "name": row["name"],
+        "text": row["text"],
+        "created": format_datetime(row["created"]),
+        "updated": format_datetime(row["updated"]),
+        "is_published": row["is_published"],
+        "version": row["version"],
+    }
+
+
+def post_representations(rows, fields=None):
+    """Строит представления списка постов с учетом времени сериализации."""
+    with measure("serializer"):
+        return [post_representation(row, fields) for row in rows]
+
+
+def changed_posts(changes):
+    """
+    Запрашивает текущее состояние опубликованных постов из записей
+    журнала изменений одним запросом.
+    """
+    return post_values(
+        Post.objects.filter(
+            pk__in={change["post_id"] for change in changes},
+            is_published=True,
+        )
+    )
+
+
+def change_representation(change, posts):
+    """
+    Строит запись журнала изменений. posts — строки changed_posts
+    по id; удаленные и неопубликованные посты отдаются как None.
+    """
+    post = posts.get(change["post_id"])
+    return {
+        "post_id": change["post_id"],
+        "action": change["action"],
+        "version": change["version"],
+        "changed": format_datetime(change["changed"]),
+        "post": None if post is None else post_representation(post),
+    }
@@ -0,0 +1,36 @@
+import contextvars
+import random
+
+from django.conf import settings
+
+read_from_replica = contextvars.ContextVar("read_from_replica", default=False)
+
+# Токены и сессии всегда читаются из основной базы: только что выданный
+# токен может еще не дойти до реплики.
+PRIMARY_ONLY_APPS = ("authtoken", "sessions")
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение в реплики из REPLICA_DATABASES, если middleware
+    разрешило это для текущего запроса, а запись — в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        if read_from_replica.get() and settings.REPLICA_DATABASES:
+            return random.choice(settings.REPLICA_DATABASES)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплик обновляется репликацией основной базы.
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
@@ -1,9 +1,90 @@
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import serializers
 
-from posts.models import Post
+from api.metrics import measure
+from posts.models import AuthorPostStats, Post
 
 
-class PostSerializer(serializers.ModelSerializer):
+class MeasuredDataMixin:
+    """Учитывает построение представления во времени сериализации."""
+
+    @property
+    def data(self):
+        with measure("serializer"):
+            return super().data
+
+
+class PostListSerializer(MeasuredDataMixin, serializers.ListSerializer):
+    """
+    Сериализатор списка постов для пакетных операций.
+    Создает и обновляет посты одним запросом и сообщает о нарушении
+    уникальности названия у автора для каждого элемента отдельно.
+    """
+
+    conflict_message = next(
+        constraint.violation_error_message
+        for constraint in Post._meta.constraints
+        if constraint.name == "unique_author_post"
+    )
+
+    def to_internal_value(self, data):
+        validated_data = super().to_internal_value(data)
+        instances = self.instance or [None] * len(validated_data)
+        user = self.context["request"].user
+
+        keys = [
+            (
+                instance.author_id if instance else user.id,
+                item.get("name", instance.name if instance else None),
+            )
+            for instance, item in zip(instances, validated_data)
+        ]
+        pks = [instance.pk for instance in instances if instance]
+        existing = set(
+            Post.objects.filter(
+                author_id__in={author_id for author_id, _ in keys},
+                name__in={name for _, name in keys},
+            )
+            .exclude(pk__in=pks)
+            .values_list("author_id", "name")
+        )
+
+        errors = []
+        seen = set()
+        for key in keys:
+            if key in existing or key in seen:
+                errors.append({"name": [self.conflict_message]})
+            else:
+                errors.append({})
+            seen.add(key)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated_data
+
+    def create(self, validated_data):
+        return Post.objects.bulk_create(
+            Post(**attrs) for attrs in validated_data
+        )
+
+    def update(self, instances, validated_data):
+        fields = {"updated", "version"}
+        now = timezone.now()
+        versions = []
+        for instance, attrs in zip(instances, validated_data):
+            for field, value in attrs.items():
+                setattr(instance, field, value)
+            instance.updated = now
+            versions.append(instance.version + 1)
+            instance.version = F("version") + 1
+            fields.update(attrs)
+        Post.objects.bulk_update(instances, fields)
+        for instance, version in zip(instances, versions):
+            instance.version = version
+        return instances
+
+
+class PostSerializer(MeasuredDataMixin, serializers.ModelSerializer):
     """Сериализатор для постов."""
 
     author = serializers.SlugRelatedField(
@@ -13,3 +94,21 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         fields = "__all__"
         model = Post
+        list_serializer_class = PostListSerializer
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Подгружает автора одним JOIN вместо запроса на каждый пост."""
+        return queryset.select_related("author")
+
+
+class AuthorPostStatsSerializer(serializers.ModelSerializer):
+    """Сериализатор счетчиков постов автора."""
+
+    author = serializers.SlugRelatedField(
+        slug_field="username", read_only=True
+    )
+
+    class Meta:
+        fields = ("author", "published", "drafts")
+        model = AuthorPostStats
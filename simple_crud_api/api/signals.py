@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api.authentication import forget_token
+from api.cache import invalidate_posts_cache
+from api.metrics import query_timer
+from posts.models import Post
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list(
+        "key", flat=True
+    ):
+        forget_token(key)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_cached_posts(sender, **kwargs):
+    invalidate_posts_cache()
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # Через __dict__, чтобы не загружать отложенное поле отдельным запросом.
+    instance._loaded_username = instance.__dict__.get("username")
+
+
+@receiver(post_save, sender=User)
+def invalidate_renamed_author_posts(
+    sender, instance, created, update_fields, **kwargs
+):
+    """
+    Имя автора входит в представление его постов, поэтому при смене
+    имени посты автора считаются измененными: версия и время изменения
+    сдвигаются, и ETag, Last-Modified и журнал изменений это отражают.
+    """
+    if created or (
+        update_fields is not None and "username" not in update_fields
+    ):
+        return
+    if instance.username != instance._loaded_username:
+        instance._loaded_username = instance.username
+        Post.objects.filter(author=instance).update(
+            version=F("version") + 1, updated=timezone.now()
+        )
+        invalidate_posts_cache()
+
+
+# Обработчик post_delete для постов не регистрируется: он отключил бы
+# удаление одним запросом. Код, удаляющий посты, инвалидирует кэш сам,
+# а посты удаленного пользователя удаляются каскадно вместе с ним.
+@receiver(post_delete, sender=User)
+def invalidate_deleted_author_posts(sender, **kwargs):
+    invalidate_posts_cache()
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            apply_sqlite_pragmas(cursor, settings.SQLITE_PRAGMAS)
@@ -0,0 +1,153 @@
+import logging
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# Счетчики на случай недоступности общего хранилища: ограничение
+# продолжает действовать в пределах процесса, а не отключается.
+fallback_cache = LocMemCache("throttle-fallback", {})
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def increment(cache, key, timeout):
+    """Атомарно увеличивает счетчик окна и возвращает новое значение."""
+    if cache.add(key, 1, timeout):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Окно истекло между add и incr.
+        cache.add(key, 1, timeout)
+        return 1
+
+
+class WindowRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов счетчиком в фиксированном окне.
+    В отличие от SimpleRateThrottle, который читает и перезаписывает
+    список времен всех запросов, использует атомарные add/incr кэша,
+    поэтому точен при параллельных запросах и хранит одно число.
+
+    Норма ищется в DEFAULT_THROTTLE_RATES сначала по ключу
+    «<scope>:<имя URL>», затем по «<scope>», что позволяет задавать
+    отдельные нормы для эндпоинтов.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        self.rate = None
+
+    def get_rate(self, request):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            endpoint = f"{self.scope}:{match.url_name}"
+            if endpoint in rates:
+                return endpoint, rates[endpoint]
+        return self.scope, rates.get(self.scope)
+
+    def get_ident_key(self, request):
+        """Идентификатор клиента или None, если ограничение не действует."""
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+        scope, self.rate = self.get_rate(request)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        now = self.timer()
+        window = int(now // self.duration)
+        key = self.cache_format % {"scope": scope, "ident": ident}
+        key = f"{key}:{window}"
+        try:
+            count = increment(
+                caches[settings.THROTTLE_CACHE], key, self.duration
+            )
+        except Exception:
+            logger.warning("Хранилище счетчиков недоступно", exc_info=True)
+            count = increment(fallback_cache, key, self.duration)
+
+        self.remaining = max(self.num_requests - count, 0)
+        self.reset = (window + 1) * self.duration - now
+        remember_limit(request, self)
+        return count <= self.num_requests
+
+    def wait(self):
+        return math.ceil(self.reset)
+
+
+class AnonThrottle(WindowRateThrottle):
+    """Ограничение для анонимных клиентов по IP-адресу."""
+
+    scope = "anon"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class UserThrottle(WindowRateThrottle):
+    """Ограничение для аутентифицированных пользователей."""
+
+    scope = "user"
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class WriteThrottle(WindowRateThrottle):
+    """Отдельная норма для изменяющих запросов любого клиента."""
+
+    scope = "write"
+
+    def get_ident_key(self, request):
+        if request.method in SAFE_METHODS:
+            return None
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+
+def remember_limit(request, throttle):
+    """
+    Сохраняет в запросе самое строгое из примененных ограничений
+    для заголовков RateLimit-*.
+    """
+    request = getattr(request, "_request", request)
+    current = getattr(request, "rate_limit", None)
+    limit = (throttle.remaining, throttle.num_requests, throttle.wait())
+    if current is None or limit < current:
+        request.rate_limit = limit
+
+
+def check_throttles(request):
+    """
+    Применяет DEFAULT_THROTTLE_CLASSES к запросу вне APIView
+    (в асинхронных вью) и выбрасывает Throttled при превышении нормы.
+    """
+    waits = [
+        throttle.wait()
+        for throttle in (
+            throttle_class()
+            for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES
+        )
+        if not throttle.allow_request(request, None)
+    ]
+    if waits:
+        raise exceptions.Throttled(max(waits))
@@ -1,10 +1,33 @@
+from django.conf import settings
 from django.urls import path
 
-from api.views import api_posts, api_posts_detail
+from api.async_views import aapi_posts, aapi_posts_detail, aapi_posts_events
+from api.views import (
+    api_metrics,
+    api_posts,
+    api_posts_bulk,
+    api_posts_changes,
+    api_posts_detail,
+    api_posts_export,
+    api_posts_stats,
+    api_token,
+)
 
 app_name = "api"
 
+if settings.ASYNC_API:
+    posts_view, posts_detail_view = aapi_posts, aapi_posts_detail
+else:
+    posts_view, posts_detail_view = api_posts, api_posts_detail
+
 urlpatterns = [
-    path("posts/", api_posts, name="api_posts"),
-    path("posts/<int:pk>/", api_posts_detail, name="api_posts_detail"),
+    path("posts/", posts_view, name="api_posts"),
+    path("posts/bulk/", api_posts_bulk, name="api_posts_bulk"),
+    path("posts/export/", api_posts_export, name="api_posts_export"),
+    path("posts/changes/", api_posts_changes, name="api_posts_changes"),
+    path("posts/events/", aapi_posts_events, name="api_posts_events"),
+    path("posts/stats/", api_posts_stats, name="api_posts_stats"),
+    path("posts/<int:pk>/", posts_detail_view, name="api_posts_detail"),
+    path("auth/token/", api_token, name="api_token"),
+    path("metrics/", api_metrics, name="api_metrics"),
 ]
@@ -1,18 +1,286 @@
-from drf_spectacular.utils import OpenApiResponse, extend_schema
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F, Subquery
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    inline_serializer,
+)
+from rest_framework import serializers, status
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+    renderer_classes,
+)
+from rest_framework.permissions import (
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
 from rest_framework.response import Response
 
-from api.serializers import PostSerializer
-from posts.models import Post
+from api.authentication import CachedTokenAuthentication
+from api.cache import cache_anonymous_get, invalidate_posts_cache
+from api.conditional import conditional_get, get_if_match_versions, make_etag
+from api.export import (
+    aexport_rows,
+    astream_csv,
+    astream_ndjson,
+    export_rows,
+    stream_csv,
+    stream_ndjson,
+)
+from api.filters import PostFilterSerializer, filter_posts, requests_drafts
+from api.metrics import measure, registry
+from api.pagination import (
+    ChangesPagination,
+    KeysetPagination,
+    SearchPagination,
+)
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api.representations import (
+    CHANGE_VALUES,
+    POST_FIELDS,
+    change_representation,
+    changed_posts,
+    post_representation,
+    post_representations,
+    post_values,
+    select_fields,
+)
+from api.serializers import AuthorPostStatsSerializer, PostSerializer
+from posts.changes import committed_changes
+from posts.models import AuthorPostStats, Post, PostChange, PostStats
+from posts.search import search_posts
+
+User = get_user_model()
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="cursor",
+        type=str,
+        description="Непрозрачный курсор из полей `next`/`previous`",
+    ),
+    OpenApiParameter(
+        name="page_size",
+        type=int,
+        description=(
+            "Количество постов на странице "
+            f"(не больше {settings.MAX_PAGE_SIZE})"
+        ),
+    ),
+]
+
+SEARCH_PARAMETER = OpenApiParameter(
+    name="q",
+    type=str,
+    description=(
+        "Полнотекстовый поиск по названию и тексту; "
+        "результаты упорядочены по релевантности"
+    ),
+)
+
+FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=str,
+        description=(
+            "Поля поста в ответе через запятую: "
+            f"{', '.join(POST_FIELDS)}. Из базы читаются только они"
+        ),
+    ),
+    OpenApiParameter(
+        name="omit",
+        type=str,
+        description="Поля поста, исключаемые из ответа, через запятую",
+    ),
+]
+
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name="If-Match",
+    type=str,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "ETag поста из ответа на GET: запись выполняется, только если "
+        "пост с тех пор не изменился"
+    ),
+)
+
+PRECONDITION_FAILED_RESPONSE = OpenApiResponse(
+    response=None, description="Пост изменен после получения ETag"
+)
+
+PAGINATED_POSTS = inline_serializer(
+    name="PaginatedPostList",
+    fields={
+        "next": serializers.URLField(allow_null=True),
+        "previous": serializers.URLField(allow_null=True),
+        "results": PostSerializer(many=True),
+    },
+)
+
+
+def posts_feed(request, fields=None):
+    """
+    Возвращает пагинатор и запрос ленты постов с учетом фильтров.
+    С параметром q лента заменяется результатами поиска.
+    Из базы читаются только столбцы полей fields и полей сортировки.
+    """
+    queryset, ordering = filter_posts(
+        Post.objects.all(), request.query_params, request.user
+    )
+    query = request.query_params.get("q", "").strip()
+    if query:
+        paginator = SearchPagination()
+        queryset = search_posts(queryset, query)
+    else:
+        paginator = KeysetPagination(ordering)
+    extra = [field.lstrip("-") for field in paginator.ordering]
+    return paginator, post_values(queryset, fields, extra)
+
+
+def posts_state(request):
+    """
+    Версия ленты: число опубликованных постов и время последнего
+    изменения. Last-Modified для ленты не отдается: удаление или снятие
+    с публикации не сдвигает время изменения оставшихся постов, а
+    версия при этом меняется вместе с числом постов.
+    """
+    # Число постов берется из счетчиков, а время изменения — из индекса
+    # post_published_updated_idx, поэтому таблица постов не сканируется.
+    modified = (
+        Post.objects.filter(is_published=True)
+        .order_by("-updated")
+        .values("updated")[:1]
+    )
+    state = (
+        PostStats.objects.filter(pk=1)
+        .values("published", modified=Subquery(modified))
+        .first()
+    ) or {"published": 0, "modified": None}
+    modified = state["modified"]
+    timestamp = modified.timestamp() if modified else 0
+    return f"{state['published']}.{timestamp}", None
+
+
+def is_drafts_request(request):
+    """
+    Черновики зависят от пользователя, а состояние ленты кэшируется
+    общим для всех, поэтому запросы черновиков не участвуют в условных
+    запросах.
+    """
+    return requests_drafts(request.query_params)
+
+
+def post_state(request, pk):
+    """Версия поста — номер версии и время последнего изменения."""
+    state = Post.objects.filter(pk=pk).values_list("version", "updated")
+    return state.first()
+
+
+def get_editable_posts(request, pk):
+    """
+    Пост с этим ID, если пользователь может его изменять и версия
+    совпадает с If-Match: проверки выполняются в том же запросе,
+    что и запись.
+    """
+    posts = Post.objects.filter(pk=pk)
+    if not request.user.is_superuser:
+        posts = posts.filter(author_id=request.user.id)
+    versions = get_if_match_versions(request)
+    if versions is not None:
+        posts = posts.filter(version__in=versions)
+    return posts
+
+
+def update_posts(posts, validated_data):
+    """
+    Обновляет посты одним запросом UPDATE, увеличивая версию, и
+    возвращает их число. Записываются только переданные поля, поэтому
+    одновременные изменения разных полей не затирают друг друга.
+    """
+    updated = posts.update(
+        **validated_data,
+        updated=timezone.now(),
+        version=F("version") + 1,
+    )
+    if updated:
+        invalidate_posts_cache()
+    return updated
+
+
+def delete_posts(posts):
+    """
+    Удаляет посты и возвращает их число. На посты не ссылаются внешние
+    ключи с каскадным удалением, поисковый индекс и счетчики обновляют
+    триггеры в базе данных, а у постов нет обработчиков post_delete,
+    поэтому Django удаляет их одним запросом DELETE без выборки.
+    """
+    deleted, _ = posts.delete()
+    if deleted:
+        invalidate_posts_cache()
+    return deleted
+
+
+def get_write_error(request, pk):
+    """
+    Причина, по которой запись не затронула пост: 404, если поста нет,
+    403, если он чужой, и 412, если его версия не совпала с If-Match.
+    Возвращает кортеж (статус, сообщение).
+    """
+    author_id = (
+        Post.objects.filter(pk=pk).values_list("author_id", flat=True).first()
+    )
+    if author_id is None:
+        return status.HTTP_404_NOT_FOUND, "Поста с таким ID не существует"
+    if author_id != request.user.id and not request.user.is_superuser:
+        return status.HTTP_403_FORBIDDEN, "Попытка изменить чужой контент"
+    return (
+        status.HTTP_412_PRECONDITION_FAILED,
+        "Пост был изменен: получите актуальную версию и повторите запрос",
+    )
+
+
+def write_error_response(request, pk):
+    status_code, message = get_write_error(request, pk)
+    return Response({"error": message}, status=status_code)
 
 
 @extend_schema(
     request=PostSerializer,
     methods=["GET"],
+    operation_id="posts_list",
+    parameters=[
+        PostFilterSerializer,
+        SEARCH_PARAMETER,
+        *FIELDS_PARAMETERS,
+        *PAGINATION_PARAMETERS,
+    ],
     responses={
-        status.HTTP_200_OK: PostSerializer(many=True),
+        status.HTTP_200_OK: PAGINATED_POSTS,
+        status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+            response=None, description="Данные не изменились"
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            response=None,
+            description="Неверные параметры фильтрации или выбора полей",
+        ),
+        status.HTTP_403_FORBIDDEN: OpenApiResponse(
+            response=None,
+            description="Черновики запрошены без авторизации",
+        ),
+        status.HTTP_404_NOT_FOUND: OpenApiResponse(
+            response=None, description="Неверный курсор"
+        ),
     },
 )
 @extend_schema(
@@ -30,29 +298,45 @@ from posts.models import Post
 )
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticatedOrReadOnly])
+@conditional_get(posts_state, skip=is_drafts_request)
+@cache_anonymous_get
 def api_posts(request):
     """
     API-вью для работы с постами.
-    Метод GET возвращает все опубликованные посты.
+    Метод GET возвращает опубликованные посты постранично
+    (keyset-пагинация по полю сортировки и id) с фильтрами по автору
+    и дате создания, черновики текущего пользователя, а с параметром q —
+    результаты полнотекстового поиска по релевантности.
     Метод POST создает новый пост для авторизованного пользователя.
     """
     if request.method == "GET":
-        posts = Post.objects.filter(is_published=True)
-        serializer = PostSerializer(posts, many=True)
-        return Response(serializer.data)
+        fields = select_fields(request.query_params)
+        paginator, queryset = posts_feed(request, fields)
+        rows = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(
+            post_representations(rows, fields)
+        )
 
     elif request.method == "POST":
         serializer = PostSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(author_id=request.user.id)
+            serializer.save(author=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @extend_schema(
     request=PostSerializer,
+    parameters=FIELDS_PARAMETERS,
     responses={
         status.HTTP_200_OK: PostSerializer,
+        status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+            response=None, description="Данные не изменились"
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            response=None,
+            description="Неизвестное поле или пустой выбор в fields и omit",
+        ),
         status.HTTP_404_NOT_FOUND: OpenApiResponse(
             response=None,
             description="Попытка запроса несуществующей публикации",
@@ -62,6 +346,7 @@ def api_posts(request):
 )
 @extend_schema(
     request=PostSerializer,
+    parameters=[IF_MATCH_PARAMETER],
     responses={
         status.HTTP_200_OK: PostSerializer,
         status.HTTP_400_BAD_REQUEST: OpenApiResponse(
@@ -74,12 +359,15 @@ def api_posts(request):
             response=None,
             description="Попытка запроса несуществующей публикации",
         ),
+        status.HTTP_412_PRECONDITION_FAILED: PRECONDITION_FAILED_RESPONSE,
     },
     methods=["PUT", "PATCH"],
 )
 @extend_schema(
     request=PostSerializer,
+    parameters=[IF_MATCH_PARAMETER],
     responses={
+        status.HTTP_412_PRECONDITION_FAILED: PRECONDITION_FAILED_RESPONSE,
         status.HTTP_204_NO_CONTENT: OpenApiResponse(
             response=None, description="Удачное выполнение запроса"
         ),
@@ -94,6 +382,8 @@ def api_posts(request):
     methods=["DELETE"],
 )
 @api_view(["GET", "PUT", "PATCH", "DELETE"])
+@conditional_get(post_state)
+@cache_anonymous_get
 def api_posts_detail(request, pk):
     """
     API-вью для работы с конкретными постами по их ID.
@@ -102,34 +392,406 @@ def api_posts_detail(request, pk):
     Метод DELETE удаляет конкретный пост.
     Методы PUT, PATCH и DELETE доступны только для автора или администратора.
     """
+    if request.method == "GET":
+        fields = select_fields(request.query_params)
+        row = post_values(Post.objects.filter(pk=pk), fields).first()
+        if row is None:
+            return Response(
+                {"error": "Поста с таким ID не существует"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        with measure("serializer"):
+            return Response(post_representation(row, fields))
+
+    posts = get_editable_posts(request, pk)
+    if request.method == "DELETE":
+        if not delete_posts(posts):
+            return write_error_response(request, pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    serializer = PostSerializer(data=request.data, partial=True)
+    if not serializer.is_valid():
+        if not posts.exists():
+            return write_error_response(request, pk)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    if not update_posts(posts, serializer.validated_data):
+        return write_error_response(request, pk)
+
     try:
-        post = Post.objects.get(pk=pk)
+        post = PostSerializer.setup_eager_loading(Post.objects).get(pk=pk)
     except Post.DoesNotExist:
-        return Response(
-            {"error": "Поста с таким ID не существует"},
-            status=status.HTTP_404_NOT_FOUND,
+        return write_error_response(request, pk)
+    response = Response(PostSerializer(post).data, status=status.HTTP_200_OK)
+    response.headers["ETag"] = make_etag(
+        post.version,
+        request.build_absolute_uri(),
+        request.accepted_renderer.format,
+    )
+    return response
+
+
+@extend_schema(
+    request=None,
+    methods=["POST"],
+    responses={
+        status.HTTP_200_OK: inline_serializer(
+            name="AuthToken", fields={"token": serializers.CharField()}
+        ),
+        status.HTTP_401_UNAUTHORIZED: OpenApiResponse(
+            response=None, description="Неверные логин или пароль"
+        ),
+    },
+)
+@extend_schema(
+    request=None,
+    methods=["DELETE"],
+    responses={
+        status.HTTP_204_NO_CONTENT: OpenApiResponse(
+            response=None, description="Токен отозван"
+        ),
+        status.HTTP_401_UNAUTHORIZED: OpenApiResponse(
+            response=None, description="Пользователь на авторизован"
+        ),
+    },
+)
+@api_view(["POST", "DELETE"])
+@authentication_classes([BasicAuthentication, CachedTokenAuthentication])
+@permission_classes([IsAuthenticated])
+def api_token(request):
+    """
+    API-вью для обмена логина и пароля на токен.
+    Метод POST с HTTP Basic аутентификацией возвращает токен пользователя,
+    который затем передается в заголовке `Authorization: Token <токен>`.
+    Метод DELETE отзывает токен пользователя.
+    """
+    if request.method == "POST":
+        token, _ = Token.objects.get_or_create(user=request.user)
+        return Response({"token": token.key})
+
+    Token.objects.filter(user=request.user).delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def get_bulk_instances(request, ids):
+    """
+    Возвращает посты в порядке переданных ID и список ошибок по элементам.
+    Изменять посты может только автор или администратор.
+    """
+    posts = PostSerializer.setup_eager_loading(Post.objects).in_bulk(ids)
+    instances, errors = [], []
+    forbidden = False
+    for pk in ids:
+        post = posts.get(pk)
+        if post is None:
+            errors.append({"id": ["Поста с таким ID не существует"]})
+        elif not (
+            post.author_id == request.user.id or request.user.is_superuser
+        ):
+            errors.append({"id": ["Попытка изменить чужой контент"]})
+            forbidden = True
+        else:
+            errors.append({})
+        instances.append(post)
+    if not any(errors):
+        return instances, None
+    if forbidden:
+        return None, Response(errors, status=status.HTTP_403_FORBIDDEN)
+    return None, Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+def get_bulk_ids(data, key=None):
+    """Извлекает ID постов из списка пакетного запроса."""
+    if not isinstance(data, list) or not data:
+        return None
+    if len(data) > settings.BULK_MAX_ITEMS:
+        return None
+    try:
+        ids = [int(item[key] if key else item) for item in data]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if len(set(ids)) != len(ids):
+        return None
+    return ids
+
+
+BULK_ERROR_RESPONSES = {
+    status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+        response=None,
+        description="Ошибки валидации по каждому элементу списка",
+    ),
+    status.HTTP_403_FORBIDDEN: OpenApiResponse(
+        response=None, description="Попытка изменить чужой контент"
+    ),
+}
+
+
+@extend_schema(
+    request=PostSerializer(many=True),
+    methods=["POST"],
+    responses={
+        status.HTTP_201_CREATED: PostSerializer(many=True),
+        **BULK_ERROR_RESPONSES,
+    },
+)
+@extend_schema(
+    request=PostSerializer(many=True),
+    methods=["PATCH"],
+    responses={
+        status.HTTP_200_OK: PostSerializer(many=True),
+        **BULK_ERROR_RESPONSES,
+    },
+)
+@extend_schema(
+    request=serializers.ListField(child=serializers.IntegerField()),
+    methods=["DELETE"],
+    responses={
+        status.HTTP_204_NO_CONTENT: OpenApiResponse(
+            response=None, description="Удачное выполнение запроса"
+        ),
+        **BULK_ERROR_RESPONSES,
+    },
+)
+@api_view(["POST", "PATCH", "DELETE"])
+@permission_classes([IsAuthenticated])
+def api_posts_bulk(request):
+    """
+    API-вью для пакетной работы с постами в одной транзакции.
+    Метод POST создает посты из списка.
+    Метод PATCH обновляет посты из списка объектов с полем `id`.
+    Метод DELETE удаляет посты по списку ID.
+    Ошибки возвращаются списком, по одному элементу на каждый пост.
+    Методы PATCH и DELETE доступны только для автора или администратора.
+    """
+    if request.method == "POST":
+        serializer = PostSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.BULK_MAX_ITEMS,
+            context={"request": request},
         )
+        if serializer.is_valid():
+            with transaction.atomic():
+                serializer.save(author=request.user)
+                invalidate_posts_cache()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    if request.method == "GET":
-        serializer = PostSerializer(post)
-        return Response(serializer.data)
+    ids = get_bulk_ids(
+        request.data, key="id" if request.method == "PATCH" else None
+    )
+    if ids is None:
+        return Response(
+            {
+                "error": (
+                    "Ожидается непустой список уникальных ID "
+                    f"(не более {settings.BULK_MAX_ITEMS})"
+                )
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    elif post.author == request.user or request.user.is_superuser:
-        if request.method in ["PUT", "PATCH"]:
-            serializer = PostSerializer(post, data=request.data, partial=True)
+    with transaction.atomic():
+        instances, error_response = get_bulk_instances(request, ids)
+        if error_response:
+            return error_response
 
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            return Response(
-                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+        if request.method == "PATCH":
+            serializer = PostSerializer(
+                instances,
+                data=request.data,
+                many=True,
+                partial=True,
+                context={"request": request},
             )
+            if not serializer.is_valid():
+                return Response(
+                    serializer.errors, status=status.HTTP_400_BAD_REQUEST
+                )
+            serializer.save()
+            invalidate_posts_cache()
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        Post.objects.filter(pk__in=ids).delete()
+        invalidate_posts_cache()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-        elif request.method == "DELETE":
-            post.delete()
-            return Response(status=status.HTTP_204_NO_CONTENT)
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="format",
+            type=str,
+            enum=["ndjson", "csv"],
+            description="Формат выгрузки (также по заголовку Accept)",
+        ),
+    ],
+    responses={
+        (status.HTTP_200_OK, NDJSONRenderer.media_type): OpenApiResponse(
+            response=OpenApiTypes.STR, description="Посты в формате JSON Lines"
+        ),
+        (status.HTTP_200_OK, CSVRenderer.media_type): OpenApiResponse(
+            response=OpenApiTypes.STR, description="Посты в формате CSV"
+        ),
+    },
+)
+@api_view(["GET"])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+def api_posts_export(request):
+    """
+    API-вью для выгрузки всех опубликованных постов.
+    Метод GET отдает посты потоком в формате JSON Lines или CSV,
+    поэтому расход памяти не зависит от размера таблицы. Под ASGI
+    поток асинхронный.
+    """
+    queryset = Post.objects.filter(is_published=True)
+    renderer = request.accepted_renderer
+    is_csv = renderer.format == CSVRenderer.format
+    if isinstance(request._request, ASGIRequest):
+        rows = aexport_rows(queryset, settings.EXPORT_CHUNK_SIZE)
+        content = astream_csv(rows) if is_csv else astream_ndjson(rows)
     else:
-        return Response(
-            {"error": "Попытка изменить чужой контент"},
-            status=status.HTTP_403_FORBIDDEN,
+        rows = export_rows(queryset, settings.EXPORT_CHUNK_SIZE)
+        content = stream_csv(rows) if is_csv else stream_ndjson(rows)
+
+    response = StreamingHttpResponse(
+        content, content_type=f"{renderer.media_type}; charset=utf-8"
+    )
+    if is_csv:
+        response.headers[
+            "Content-Disposition"
+        ] = 'attachment; filename="posts.csv"'
+    return response
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="author",
+            type=str,
+            description="Имя автора, счетчики которого нужно вернуть",
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: inline_serializer(
+            name="PostStats",
+            fields={
+                "published": serializers.IntegerField(),
+                "drafts": serializers.IntegerField(),
+                "authors": AuthorPostStatsSerializer(many=True),
+            },
+        ),
+        status.HTTP_404_NOT_FOUND: OpenApiResponse(
+            description="Автора с таким именем не существует"
+        ),
+    },
+)
+@api_view(["GET"])
+def api_posts_stats(request):
+    """
+    API-вью для статистики постов.
+    Метод GET возвращает число опубликованных постов и черновиков
+    и авторов с наибольшим числом опубликованных постов, а с параметром
+    author — счетчики одного автора. Данные читаются из счетчиков,
+    которые поддерживаются при каждом изменении постов, а не считаются
+    по таблице постов.
+    """
+    username = request.query_params.get("author")
+    if username is not None:
+        stats = (
+            AuthorPostStats.objects.select_related("author")
+            .filter(author__username=username)
+            .first()
         )
+        if stats is None:
+            author = User.objects.filter(username=username).first()
+            if author is None:
+                return Response(
+                    {"error": "Автора с таким именем не существует"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            stats = AuthorPostStats(author=author)
+        return Response(AuthorPostStatsSerializer(stats).data)
+
+    totals = PostStats.get()
+    authors = AuthorPostStats.objects.select_related("author").order_by(
+        "-published"
+    )[: settings.STATS_TOP_AUTHORS]
+    return Response(
+        {
+            "published": totals.published,
+            "drafts": totals.drafts,
+            "authors": AuthorPostStatsSerializer(authors, many=True).data,
+        }
+    )
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="since",
+            type=str,
+            description=(
+                "Курсор из поля `cursor` предыдущего ответа; без него "
+                "журнал читается с начала"
+            ),
+        ),
+        PAGINATION_PARAMETERS[1],
+    ],
+    responses={
+        status.HTTP_200_OK: inline_serializer(
+            name="PostChanges",
+            fields={
+                "cursor": serializers.CharField(allow_null=True),
+                "has_more": serializers.BooleanField(),
+                "results": inline_serializer(
+                    name="PostChange",
+                    fields={
+                        "post_id": serializers.IntegerField(),
+                        "action": serializers.ChoiceField(
+                            choices=PostChange.ACTIONS
+                        ),
+                        "version": serializers.IntegerField(),
+                        "changed": serializers.DateTimeField(),
+                        "post": PostSerializer(allow_null=True),
+                    },
+                    many=True,
+                ),
+            },
+        ),
+        status.HTTP_404_NOT_FOUND: OpenApiResponse(
+            response=None, description="Неверный курсор"
+        ),
+    },
+)
+@api_view(["GET"])
+def api_posts_changes(request):
+    """
+    API-вью для инкрементальной синхронизации постов.
+    Метод GET возвращает изменения постов после курсора since в порядке
+    фиксации транзакций и курсор для следующего запроса. Для каждого
+    изменения отдается текущее состояние поста или null, если пост
+    удален или не опубликован. Стоимость запроса зависит от числа
+    изменений, а не от числа постов.
+    """
+    paginator = ChangesPagination()
+    changes = paginator.paginate_queryset(
+        committed_changes(PostChange.objects.values(*CHANGE_VALUES)),
+        request,
+    )
+    posts = {row["id"]: row for row in changed_posts(changes)}
+    with measure("serializer"):
+        results = [change_representation(change, posts) for change in changes]
+    return paginator.get_paginated_response(results)
+
+
+@require_GET
+def api_metrics(request):
+    """
+    Отдает агрегированные показатели запросов в текстовом формате
+    Prometheus.
+    """
+    return HttpResponse(
+        registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after")
+    list_filter = ("status", "name")
+    readonly_fields = ("attempts", "locked_until", "last_error", "created")
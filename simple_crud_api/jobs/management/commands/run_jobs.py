@@ -0,0 +1,90 @@
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    """
+    Обработчик фоновой очереди: захватывает задачи по числу свободных
+    исполнителей пула и выполняет их в потоках или процессах.
+    """
+
+    help = "Выполняет задачи фоновой очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.JOBS_WORKERS,
+            help="Число исполнителей пула",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Выполнять задачи в процессах вместо потоков",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить готовые задачи и завершиться",
+        )
+
+    def get_executor(self, workers, processes):
+        if not processes:
+            return ThreadPoolExecutor(workers)
+        # Процессы запускаются через spawn: дочерний процесс
+        # не наследует открытые соединения с базой.
+        connections.close_all()
+        return ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+
+    def collect(self, running):
+        """Убирает завершенные задачи и сообщает об ошибках пула."""
+        done = {future for future in running if future.done()}
+        for future in done:
+            if future.exception() is not None:
+                self.stderr.write(
+                    f"Ошибка обработчика: {future.exception()!r}"
+                )
+        return running - done
+
+    def handle(self, *args, workers, processes, once, **options):
+        running = set()
+        with self.get_executor(workers, processes) as executor:
+            try:
+                while True:
+                    running = self.collect(running)
+                    free = workers - len(running)
+                    claimed = claim_jobs(free) if free > 0 else []
+                    running.update(
+                        executor.submit(run_job, pk) for pk in claimed
+                    )
+                    if once and not claimed and not running:
+                        break
+                    if claimed:
+                        continue
+                    if running:
+                        wait(
+                            running,
+                            timeout=settings.JOBS_POLL_INTERVAL,
+                            return_when=FIRST_COMPLETED,
+                        )
+                    else:
+                        time.sleep(settings.JOBS_POLL_INTERVAL)
+            except KeyboardInterrupt:
+                self.stdout.write("Остановка: ожидание выполняемых задач")
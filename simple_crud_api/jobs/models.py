@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Задача фоновой очереди: путь к функции и ее именованные аргументы.
+    Выполненные задачи удаляются, задачи с исчерпанными попытками
+    остаются со статусом failed и текстом последней ошибки.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "В очереди"
+        RUNNING = "running", "Выполняется"
+        FAILED = "failed", "Ошибка"
+
+    name = models.CharField("Функция", max_length=255)
+    payload = models.JSONField("Аргументы", default=dict)
+    status = models.CharField(
+        "Статус",
+        max_length=7,
+        choices=Status.choices,
+        default=Status.QUEUED,
+    )
+    attempts = models.PositiveIntegerField("Попытки", default=0)
+    run_after = models.DateTimeField("Запуск не раньше", default=timezone.now)
+    locked_until = models.DateTimeField("Захвачена до", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created = models.DateTimeField("Дата создания", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Задача"
+        verbose_name_plural = "Задачи"
+        indexes = [
+            models.Index(
+                fields=["status", "run_after", "id"],
+                name="job_status_run_after_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
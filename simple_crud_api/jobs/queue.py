@@ -0,0 +1,120 @@
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def get_task_name(task):
+    if isinstance(task, str):
+        return task
+    return f"{task.__module__}.{task.__qualname__}"
+
+
+def enqueue(task, **kwargs):
+    """
+    Ставит вызов task(**kwargs) в очередь после фиксации текущей
+    транзакции: задача не выполнится для отмененной записи, а запрос
+    тратит на нее одну вставку строки. task — функция уровня модуля
+    или путь к ней; аргументы должны сериализоваться в JSON.
+    """
+    transaction.on_commit(
+        partial(Job.objects.create, name=get_task_name(task), payload=kwargs),
+        robust=True,
+    )
+
+
+def claimable(now):
+    """
+    Задачи, готовые к запуску, и задачи, захват которых истек:
+    обработчик, взявший их, завершился, не записав результат.
+    """
+    return Q(status=Job.Status.QUEUED, run_after__lte=now) | Q(
+        status=Job.Status.RUNNING, locked_until__lt=now
+    )
+
+
+def claim_jobs(limit):
+    """
+    Захватывает до limit задач и возвращает их id. Захват — условный
+    UPDATE по тем же условиям, поэтому задачу получает только один
+    из параллельных обработчиков без блокировок.
+    """
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(claimable(now))
+        .order_by("run_after", "id")
+        .values_list("id", flat=True)[:limit]
+    )
+    locked_until = now + timedelta(seconds=settings.JOBS_LEASE)
+    return [
+        pk
+        for pk in list(candidates)
+        if Job.objects.filter(claimable(now), pk=pk).update(
+            status=Job.Status.RUNNING,
+            locked_until=locked_until,
+            attempts=F("attempts") + 1,
+        )
+    ]
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед повтором после attempts попыток."""
+    return min(
+        settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.JOBS_MAX_RETRY_DELAY,
+    )
+
+
+def finish_job(job, error=None):
+    """
+    Записывает результат попытки. Условие по числу попыток не дает
+    перезаписать задачу, которую после истечения захвата уже взял
+    другой обработчик.
+    """
+    jobs = Job.objects.filter(pk=job.pk, attempts=job.attempts)
+    if error is None:
+        jobs.delete()
+        return
+    if job.attempts < settings.JOBS_MAX_ATTEMPTS:
+        delay = get_retry_delay(job.attempts)
+        logger.warning(
+            "Задача %s завершилась ошибкой, повтор через %s с", job, delay
+        )
+        jobs.update(
+            status=Job.Status.QUEUED,
+            run_after=timezone.now() + timedelta(seconds=delay),
+            locked_until=None,
+            last_error=error,
+        )
+    else:
+        logger.error("Задача %s исчерпала попытки", job)
+        jobs.update(
+            status=Job.Status.FAILED, locked_until=None, last_error=error
+        )
+
+
+def run_job(pk):
+    """
+    Выполняет захваченную задачу. Вызывается в потоке или процессе
+    пула обработчика, поэтому закрывает устаревшие соединения с базой.
+    """
+    try:
+        job = Job.objects.get(pk=pk)
+        try:
+            import_string(job.name)(**job.payload)
+        except Exception:
+            finish_job(job, traceback.format_exc())
+        else:
+            finish_job(job)
+    finally:
+        close_old_connections()
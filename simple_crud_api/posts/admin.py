@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from api.cache import invalidate_posts_cache
 from posts.models import Post
 
 EMPTY_VALUE_DISPLAY = "-пусто-"
@@ -11,3 +12,13 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ("author", "is_published")
     list_display_links = ("id", "name")
     empty_value_display = EMPTY_VALUE_DISPLAY
+
+    # Удаление постов не отправляет сигнал post_delete (см.
+    # api.signals), поэтому кэш постов инвалидируется здесь.
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_posts_cache()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_posts_cache()
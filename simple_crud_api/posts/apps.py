@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+from posts.changes import ensure_changes_triggers
+from posts.search import ensure_search_triggers
+from posts.stats import ensure_stats_triggers
+
+
+def restore_triggers(sender, using, **kwargs):
+    ensure_search_triggers(connections[using])
+    ensure_stats_triggers(connections[using])
+    ensure_changes_triggers(connections[using])
 
 
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "posts"
+
+    def ready(self):
+        post_migrate.connect(restore_triggers, sender=self)
@@ -0,0 +1,119 @@
+from django.db import connections
+from django.db.models import BigIntegerField
+from django.db.models.expressions import RawSQL
+
+CHANGES_TABLE = "posts_postchange"
+CHANGES_COLUMNS = "post_id, action, version, changed, txid"
+
+SQLITE_CHANGED = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+SQLITE_APPEND = f"""
+    INSERT INTO {CHANGES_TABLE}({CHANGES_COLUMNS})
+    VALUES ({{row}}.id, '{{action}}', {{row}}.version, {SQLITE_CHANGED}, 0);
+"""
+SQLITE_TRIGGERS = {
+    f"posts_post_changes_{event.lower()}": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_changes_{event.lower()}
+        AFTER {event} ON posts_post BEGIN
+            {SQLITE_APPEND.format(row=row, action=action)}
+        END
+    """
+    for event, row, action in (
+        ("INSERT", "new", "created"),
+        ("UPDATE", "new", "updated"),
+        ("DELETE", "old", "deleted"),
+    )
+}
+POSTGRES_TXID = "pg_current_xact_id()::text::bigint"
+POSTGRES_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION posts_post_changes() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO {CHANGES_TABLE}({CHANGES_COLUMNS})
+            VALUES (old.id, 'deleted', old.version, now(), {POSTGRES_TXID});
+        ELSE
+            INSERT INTO {CHANGES_TABLE}({CHANGES_COLUMNS})
+            VALUES (
+                new.id,
+                CASE TG_OP WHEN 'INSERT' THEN 'created' ELSE 'updated' END,
+                new.version,
+                now(),
+                {POSTGRES_TXID}
+            );
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+POSTGRES_TRIGGER = "posts_post_changes"
+# Транзакции с номером не меньше xmin текущего снимка могут быть еще
+# не зафиксированы: их записи станут видны позже, поэтому журнал
+# отдается только до этой границы.
+POSTGRES_HORIZON = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+def create_changes_triggers(connection):
+    """
+    Создает триггеры, которые добавляют запись в журнал изменений при
+    каждом создании, изменении и удалении поста, в том числе через
+    пакетные операции и админку.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+        elif connection.vendor == "postgresql":
+            cursor.execute(POSTGRES_FUNCTION)
+            cursor.execute(
+                f"DROP TRIGGER IF EXISTS {POSTGRES_TRIGGER} ON posts_post"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {POSTGRES_TRIGGER} "
+                "AFTER INSERT OR UPDATE OR DELETE ON posts_post "
+                "FOR EACH ROW EXECUTE FUNCTION posts_post_changes()"
+            )
+
+
+def drop_changes_triggers(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"DROP TRIGGER IF EXISTS {POSTGRES_TRIGGER} ON posts_post"
+            )
+            cursor.execute("DROP FUNCTION IF EXISTS posts_post_changes()")
+
+
+def ensure_changes_triggers(connection):
+    """
+    Восстанавливает триггеры журнала после миграций: SQLite теряет их
+    при пересоздании таблицы постов.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'posts_post'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [CHANGES_TABLE],
+        )
+        if cursor.fetchone() is None or existing >= set(SQLITE_TRIGGERS):
+            return
+    create_changes_triggers(connection)
+
+
+def committed_changes(queryset):
+    """
+    Оставляет записи журнала, после которых не может появиться
+    записей из еще не зафиксированных транзакций.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        return queryset.filter(
+            txid__lt=RawSQL(POSTGRES_HORIZON, [], BigIntegerField())
+        )
+    return queryset
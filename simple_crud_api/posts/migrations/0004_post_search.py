@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import posts.models
+from posts.search import create_search_index, drop_search_index
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0003_post_updated"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostSearch",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search",
+                        serialize=False,
+                        to="posts.post",
+                    ),
+                ),
+                ("name", models.TextField()),
+                ("text", models.TextField()),
+                (
+                    "document",
+                    posts.models.SearchField(db_column="posts_post_fts"),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "posts_post_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
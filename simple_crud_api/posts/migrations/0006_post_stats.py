@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from posts.stats import create_stats_triggers, drop_stats_triggers
+
+
+def create_triggers(apps, schema_editor):
+    create_stats_triggers(schema_editor.connection)
+
+
+def drop_triggers(apps, schema_editor):
+    drop_stats_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0005_post_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('published', models.IntegerField(default=0, verbose_name='Опубликовано')),
+                ('drafts', models.IntegerField(default=0, verbose_name='Черновики')),
+            ],
+            options={
+                'verbose_name': 'Статистика постов',
+                'verbose_name_plural': 'Статистика постов',
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthorPostStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('published', models.IntegerField(default=0, verbose_name='Опубликовано')),
+                ('drafts', models.IntegerField(default=0, verbose_name='Черновики')),
+            ],
+            options={
+                'verbose_name': 'Статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+                'indexes': [models.Index(fields=['-published'], name='author_stats_published_idx')],
+            },
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:11
+
+from django.db import migrations, models
+
+from posts.changes import create_changes_triggers, drop_changes_triggers
+
+
+def create_triggers(apps, schema_editor):
+    create_changes_triggers(schema_editor.connection)
+
+
+def drop_triggers(apps, schema_editor):
+    drop_changes_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_id', models.BigIntegerField(verbose_name='ID поста')),
+                ('action', models.CharField(choices=[('created', 'Создан'), ('updated', 'Изменен'), ('deleted', 'Удален')], max_length=7, verbose_name='Действие')),
+                ('version', models.PositiveIntegerField(verbose_name='Версия поста')),
+                ('changed', models.DateTimeField(verbose_name='Время изменения')),
+                ('txid', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Изменение поста',
+                'verbose_name_plural': 'Изменения постов',
+                'indexes': [models.Index(fields=['txid', 'id'], name='post_change_cursor_idx')],
+            },
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
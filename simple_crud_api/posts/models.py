@@ -11,8 +11,10 @@ class Post(models.Model):
     name = models.CharField("Название", max_length=settings.TITLE_MAX_LENGTH)
     text = models.TextField("Текст")
     created = models.DateTimeField("Дата создания", auto_now_add=True)
+    updated = models.DateTimeField("Дата изменения", auto_now=True)
     is_published = models.BooleanField("Опубликовано", default=False)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+    version = models.PositiveIntegerField("Версия", default=1, editable=False)
 
     class Meta:
         verbose_name = "Пост"
@@ -27,6 +29,159 @@ class Post(models.Model):
                 ),
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["-created", "-id"],
+                name="post_published_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=["-updated", "-id"],
+                name="post_published_updated_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=["author", "-created", "-id"],
+                name="post_author_created_idx",
+            ),
+            models.Index(
+                fields=["author", "-updated", "-id"],
+                name="post_author_updated_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """
+        Увеличивает версию при каждом сохранении существующего поста.
+        API изменяет посты через QuerySet.update со сравнением версии,
+        а save используют админка и остальной код.
+        """
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+
+class AuthorPostStats(models.Model):
+    """
+    Счетчики постов автора. Их обновляют триггеры в базе данных
+    в той же транзакции, что и изменение постов (см. posts.stats).
+    """
+
+    author = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="post_stats",
+    )
+    published = models.IntegerField("Опубликовано", default=0)
+    drafts = models.IntegerField("Черновики", default=0)
+
+    class Meta:
+        verbose_name = "Статистика автора"
+        verbose_name_plural = "Статистика авторов"
+        indexes = [
+            models.Index(
+                fields=["-published"], name="author_stats_published_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.author)
+
+
+class PostStats(models.Model):
+    """Общие счетчики постов: единственная строка с id=1."""
+
+    published = models.IntegerField("Опубликовано", default=0)
+    drafts = models.IntegerField("Черновики", default=0)
+
+    class Meta:
+        verbose_name = "Статистика постов"
+        verbose_name_plural = "Статистика постов"
+
+    @classmethod
+    def get(cls):
+        return cls.objects.filter(pk=1).first() or cls(pk=1)
+
+
+class PostChange(models.Model):
+    """
+    Журнал изменений постов для инкрементальной синхронизации.
+    Записи добавляют триггеры в базе данных в той же транзакции, что и
+    изменение поста (см. posts.changes); удаленный пост остается
+    в журнале записью с действием «deleted».
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ACTIONS = (
+        (CREATED, "Создан"),
+        (UPDATED, "Изменен"),
+        (DELETED, "Удален"),
+    )
+
+    post_id = models.BigIntegerField("ID поста")
+    action = models.CharField("Действие", max_length=7, choices=ACTIONS)
+    version = models.PositiveIntegerField("Версия поста")
+    changed = models.DateTimeField("Время изменения")
+    # Номер транзакции в PostgreSQL: журнал читается в порядке фиксации
+    # транзакций. В SQLite транзакции записи не пересекаются, и порядок
+    # задает id.
+    txid = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Изменение поста"
+        verbose_name_plural = "Изменения постов"
+        indexes = [
+            models.Index(fields=["txid", "id"], name="post_change_cursor_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id}: {self.action}"
+
+
+class SearchField(models.TextField):
+    """
+    Скрытый столбец виртуальной таблицы FTS5 с ее же именем.
+    Используется только как левая часть оператора MATCH.
+    """
+
+
+@SearchField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", (*lhs_params, *rhs_params)
+
+
+class PostSearch(models.Model):
+    """
+    Полнотекстовый индекс постов в SQLite: виртуальная таблица FTS5,
+    которую триггеры синхронизируют с таблицей постов.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search",
+    )
+    name = models.TextField()
+    text = models.TextField()
+    document = SearchField(db_column="posts_post_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "posts_post_fts"
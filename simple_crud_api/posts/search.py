@@ -0,0 +1,144 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "posts_post_fts"
+SEARCH_TRIGGERS = {
+    "posts_post_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_fts_insert
+        AFTER INSERT ON posts_post BEGIN
+            INSERT INTO {SEARCH_TABLE}(rowid, name, text)
+            VALUES (new.id, new.name, new.text);
+        END
+    """,
+    "posts_post_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_fts_delete
+        AFTER DELETE ON posts_post BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, text)
+            VALUES ('delete', old.id, old.name, old.text);
+        END
+    """,
+    "posts_post_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_fts_update
+        AFTER UPDATE OF name, text ON posts_post BEGIN
+            INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, text)
+            VALUES ('delete', old.id, old.name, old.text);
+            INSERT INTO {SEARCH_TABLE}(rowid, name, text)
+            VALUES (new.id, new.name, new.text);
+        END
+    """,
+}
+# Выражение должно совпадать с выражением GIN-индекса post_search_idx,
+# иначе PostgreSQL не сможет его использовать.
+POSTGRES_VECTOR = "to_tsvector('simple', name || ' ' || text)"
+POSTGRES_QUERY = "websearch_to_tsquery('simple', %s)"
+
+WORD_RE = re.compile(r"\w+")
+
+
+def create_search_index(connection):
+    """Создает полнотекстовый индекс постов для текущей СУБД."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                "USING fts5(name, text, content='posts_post', "
+                "content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            for sql in SEARCH_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS post_search_idx ON posts_post "
+                f"USING gin (({POSTGRES_VECTOR}))"
+            )
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for name in SEARCH_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+        elif connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS post_search_idx")
+
+
+def ensure_search_triggers(connection):
+    """
+    Восстанавливает триггеры FTS5 после миграций.
+    SQLite пересоздает таблицу при изменении ее схемы и теряет триггеры,
+    поэтому после их восстановления индекс перестраивается целиком.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'posts_post'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SEARCH_TABLE],
+        )
+        if cursor.fetchone() is None or existing >= set(SEARCH_TRIGGERS):
+            return
+    create_search_index(connection)
+
+
+def make_match_query(query):
+    """
+    Превращает пользовательскую строку в запрос FTS5: каждое слово
+    берется в кавычки, слова объединяются через AND.
+    """
+    return " ".join(f'"{word}"' for word in WORD_RE.findall(query))
+
+
+def search_posts(queryset, query):
+    """
+    Фильтрует посты по полнотекстовому запросу и добавляет поле rank:
+    чем оно меньше, тем выше релевантность.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        match = make_match_query(query)
+        if not match:
+            return no_results(queryset)
+        return queryset.filter(search__document__match=match).annotate(
+            rank=F("search__rank")
+        )
+    if vendor == "postgresql":
+        return queryset.filter(
+            RawSQL(
+                f"{POSTGRES_VECTOR} @@ {POSTGRES_QUERY}",
+                [query],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            rank=RawSQL(
+                f"-ts_rank({POSTGRES_VECTOR}, {POSTGRES_QUERY})",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+    words = WORD_RE.findall(query)
+    if not words:
+        return no_results(queryset)
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(text__icontains=word)
+    return queryset.filter(condition).annotate(
+        rank=Value(0.0, output_field=FloatField())
+    )
+
+
+def no_results(queryset):
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
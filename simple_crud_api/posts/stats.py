@@ -0,0 +1,174 @@
+AUTHORS_TABLE = "posts_authorpoststats"
+TOTALS_TABLE = "posts_poststats"
+
+# Выражения вклада строки поста в счетчики для каждой СУБД.
+COUNTS = {
+    "sqlite": ("{row}.is_published", "(NOT {row}.is_published)"),
+    "postgresql": (
+        "{row}.is_published::int",
+        "(NOT {row}.is_published)::int",
+    ),
+}
+
+# Увеличение создает строку счетчиков при первом посте автора.
+INCREMENT = f"""
+    INSERT INTO {AUTHORS_TABLE}(author_id, published, drafts)
+    VALUES ({{row}}.author_id, {{published}}, {{drafts}})
+    ON CONFLICT(author_id) DO UPDATE SET
+        published = {AUTHORS_TABLE}.published + excluded.published,
+        drafts = {AUTHORS_TABLE}.drafts + excluded.drafts;
+    INSERT INTO {TOTALS_TABLE}(id, published, drafts)
+    VALUES (1, {{published}}, {{drafts}})
+    ON CONFLICT(id) DO UPDATE SET
+        published = {TOTALS_TABLE}.published + excluded.published,
+        drafts = {TOTALS_TABLE}.drafts + excluded.drafts;
+"""
+# Уменьшение никогда не создает строк: при удалении пользователя его
+# счетчики могут быть удалены раньше постов.
+DECREMENT = f"""
+    UPDATE {AUTHORS_TABLE} SET
+        published = published - {{published}},
+        drafts = drafts - {{drafts}}
+    WHERE author_id = {{row}}.author_id;
+    UPDATE {TOTALS_TABLE} SET
+        published = published - {{published}},
+        drafts = drafts - {{drafts}}
+    WHERE id = 1;
+"""
+# Оба столбца NOT NULL, поэтому достаточно «<>»: IS DISTINCT FROM в SQLite
+# появился только в версии 3.39.
+CHANGED = (
+    "old.is_published <> new.is_published OR old.author_id <> new.author_id"
+)
+
+
+def render(template, vendor, row):
+    published, drafts = COUNTS[vendor]
+    return template.format(
+        row=row,
+        published=published.format(row=row),
+        drafts=drafts.format(row=row),
+    )
+
+
+SQLITE_TRIGGERS = {
+    "posts_post_stats_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_stats_insert
+        AFTER INSERT ON posts_post BEGIN
+            {render(INCREMENT, "sqlite", "new")}
+        END
+    """,
+    "posts_post_stats_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_stats_delete
+        AFTER DELETE ON posts_post BEGIN
+            {render(DECREMENT, "sqlite", "old")}
+        END
+    """,
+    "posts_post_stats_update": f"""
+        CREATE TRIGGER IF NOT EXISTS posts_post_stats_update
+        AFTER UPDATE OF is_published, author_id ON posts_post
+        WHEN {CHANGED} BEGIN
+            {render(DECREMENT, "sqlite", "old")}
+            {render(INCREMENT, "sqlite", "new")}
+        END
+    """,
+}
+POSTGRES_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION posts_post_stats() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            {render(DECREMENT, "postgresql", "old")}
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            {render(INCREMENT, "postgresql", "new")}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+POSTGRES_TRIGGERS = {
+    "posts_post_stats_insert_delete": (
+        "AFTER INSERT OR DELETE ON posts_post FOR EACH ROW"
+    ),
+    "posts_post_stats_update": (
+        "AFTER UPDATE OF is_published, author_id ON posts_post "
+        f"FOR EACH ROW WHEN ({CHANGED})"
+    ),
+}
+
+
+def create_stats_triggers(connection):
+    """
+    Создает триггеры, поддерживающие счетчики постов, и пересчитывает
+    счетчики по текущим постам. Триггеры срабатывают и для пакетных
+    операций (bulk_create, QuerySet.update и delete), и в той же
+    транзакции, что и изменение постов.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+        elif connection.vendor == "postgresql":
+            cursor.execute(POSTGRES_FUNCTION)
+            for name, event in POSTGRES_TRIGGERS.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name} ON posts_post")
+                cursor.execute(
+                    f"CREATE TRIGGER {name} {event} "
+                    "EXECUTE FUNCTION posts_post_stats()"
+                )
+    rebuild_stats(connection)
+
+
+def drop_stats_triggers(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        elif connection.vendor == "postgresql":
+            for name in POSTGRES_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name} ON posts_post")
+            cursor.execute("DROP FUNCTION IF EXISTS posts_post_stats()")
+
+
+def rebuild_stats(connection):
+    """Пересчитывает счетчики одним проходом по таблице постов."""
+    if connection.vendor not in COUNTS:
+        return
+    published, drafts = (
+        count.format(row="posts_post") for count in COUNTS[connection.vendor]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {AUTHORS_TABLE}")
+        cursor.execute(f"DELETE FROM {TOTALS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {AUTHORS_TABLE}(author_id, published, drafts) "
+            f"SELECT author_id, SUM({published}), SUM({drafts}) "
+            "FROM posts_post GROUP BY author_id"
+        )
+        cursor.execute(
+            f"INSERT INTO {TOTALS_TABLE}(id, published, drafts) "
+            f"SELECT 1, COALESCE(SUM({published}), 0), "
+            f"COALESCE(SUM({drafts}), 0) FROM posts_post"
+        )
+
+
+def ensure_stats_triggers(connection):
+    """
+    Восстанавливает триггеры счетчиков после миграций: SQLite теряет их
+    при пересоздании таблицы постов.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'posts_post'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [AUTHORS_TABLE],
+        )
+        if cursor.fetchone() is None or existing >= set(SQLITE_TRIGGERS):
+            return
+    create_stats_triggers(connection)
@@ -3,5 +3,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "simple_crud_api.settings")
+os.environ.setdefault("ASYNC_API", "True")
+# Под ASGI в Django 4.2 каждый запрос выполняется в своем потоке
+# синхронного кода, поэтому постоянные соединения с базой не
+# переиспользуются, а копятся до истечения CONN_MAX_AGE. По умолчанию
+# соединение закрывается после запроса; для переиспользования нужен
+# внешний пул соединений (например, PgBouncer).
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
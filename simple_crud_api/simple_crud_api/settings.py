@@ -13,6 +13,8 @@ DEBUG = os.getenv("DEBUG", False)
 
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "*").split(", ")
 
+ASYNC_API = os.getenv("ASYNC_API", "False").lower() in ("true", "1")
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -20,12 +22,19 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "rest_framework",
+    "rest_framework.authtoken",
     "drf_spectacular",
     "posts",
     "api",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    "api.middleware.PerformanceMiddleware",
+    "api.middleware.CompressionMiddleware",
+    "api.middleware.RateLimitHeadersMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,13 +64,88 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "simple_crud_api.wsgi.application"
 
-DATABASES = {
+ASGI_APPLICATION = "simple_crud_api.asgi.application"
+
+DB_ENGINE = os.getenv("DB_ENGINE", "django.db.backends.sqlite3")
+
+# Время жизни постоянного соединения; asgi.py по умолчанию задает 0.
+CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", 60))
+
+if DB_ENGINE == "django.db.backends.postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": DB_ENGINE,
+            "NAME": os.getenv("DB_NAME", "simple_crud_api"),
+            "USER": os.getenv("DB_USER", "postgres"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": DB_ENGINE,
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", 5)),
+            },
+        }
+    }
+
+# Реплики только для чтения: пути к файлам SQLite или хосты PostgreSQL
+# через запятую. Запросы безопасными методами читают из реплик, кроме
+# клиентов, выполнявших запись в последние REPLICA_STICKY_SECONDS секунд.
+REPLICA_DATABASES = []
+for number, replica in enumerate(
+    filter(None, os.getenv("DB_REPLICAS", "").split(","))
+):
+    alias = f"replica_{number}"
+    location = "NAME" if DB_ENGINE.endswith("sqlite3") else "HOST"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        location: replica.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+# Псевдоним кэша с отметками о недавней записи клиента. Запросы одного
+# клиента приходят в разные процессы, поэтому при нескольких процессах
+# нужен общий кэш (Redis, Memcached).
+REPLICA_STICKY_CACHE = os.getenv("REPLICA_STICKY_CACHE", "default")
+
+# Настройки SQLite, применяемые к каждому новому соединению: WAL позволяет
+# читать во время записи, synchronous=NORMAL безопасен в режиме WAL.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+}
+
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", "simple_crud_api"),
     }
 }
 
+# Псевдоним кэша со счетчиками ограничения частоты запросов. Для
+# нескольких процессов нужен общий кэш (Redis, Memcached).
+THROTTLE_CACHE = os.getenv("THROTTLE_CACHE", "default")
+
+THROTTLING = os.getenv("THROTTLING", "True").lower() in ("true", "1")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -90,10 +174,36 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "api.authentication.CachedTokenAuthentication",
+    ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttling.AnonThrottle",
+        "api.throttling.UserThrottle",
+        "api.throttling.WriteThrottle",
+    ]
+    if THROTTLING
+    else [],
+    # Нормы вида «<scope>:<имя URL>» переопределяют общую норму scope
+    # для отдельного эндпоинта.
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "120/min",
+        "user": "1200/min",
+        "write": "120/min",
+        "write:api_posts": "30/min",
+        "write:api_posts_bulk": "10/min",
+        "anon:api_posts_export": "10/min",
+        "user:api_posts_export": "30/min",
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -104,3 +214,63 @@ SPECTACULAR_SETTINGS = {
 }
 
 TITLE_MAX_LENGTH = 255
+
+PAGE_SIZE = 20
+
+MAX_PAGE_SIZE = 100
+
+BULK_MAX_ITEMS = 1000
+
+EXPORT_CHUNK_SIZE = 2000
+
+STATS_TOP_AUTHORS = 10
+
+# Поток событий: бэкенд рассылки, размер пакета чтения журнала, бюджет
+# буфера одного соединения в событиях и байтах и интервал опроса журнала
+# в секундах.
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "api.events.InProcessBroker")
+
+EVENTS_BATCH_SIZE = 100
+
+EVENTS_BUFFER_SIZE = 100
+
+EVENTS_BUFFER_BYTES = 1024 * 1024
+
+EVENTS_POLL_INTERVAL = 1
+
+EVENTS_HEARTBEAT = 15
+
+EVENTS_MAX_DURATION = 300
+
+# Фоновая очередь: число исполнителей обработчика, попытки с
+# экспоненциальной задержкой и время захвата задачи в секундах.
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", 4))
+
+JOBS_MAX_ATTEMPTS = 5
+
+JOBS_RETRY_DELAY = 10
+
+JOBS_MAX_RETRY_DELAY = 3600
+
+JOBS_LEASE = 300
+
+JOBS_POLL_INTERVAL = 1
+
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+# Поколение кэша постов хранится в кэше default. LocMemCache у каждого
+# процесса свой, и запись в одном процессе не инвалидирует ответы
+# остальных, поэтому с ним ответы хранятся лишь несколько секунд.
+# При нескольких процессах нужен общий кэш (Redis, Memcached).
+POSTS_CACHE_TIMEOUT = int(
+    os.getenv(
+        "POSTS_CACHE_TIMEOUT",
+        5 if CACHE_BACKEND.endswith(".LocMemCache") else 600,
+    )
+)
+
+COMPRESSION_MIN_SIZE = 1024
+
+COMPRESSION_GZIP_LEVEL = 6
+
+COMPRESSION_BROTLI_QUALITY = 4
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from api.async_views import aapi_posts, aapi_posts_detail
+from simple_crud_api.urls import urlpatterns as project_urlpatterns
+
+# URLconf с асинхронными вью постов, как при запуске под ASGI.
+urlpatterns = [
+    path('posts/', aapi_posts, name='api_posts'),
+    path('posts/<int:pk>/', aapi_posts_detail, name='api_posts_detail'),
+    *project_urlpatterns,
+]
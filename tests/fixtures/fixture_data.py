@@ -19,3 +19,29 @@ def another_post(another_user):
         text='Текст поста 2',
         author=another_user
     )
+
+
+@pytest.fixture
+def make_posts(user):
+    """
+    Фабрика постов: создает count постов одним запросом. Шаблоны name
+    и text форматируются номером поста, авторы чередуются по кругу,
+    is_published — значение или функция от номера.
+    """
+    def make_posts(count, name='Пост {number}', text='Текст поста {number}',
+                   authors=None, is_published=True):
+        authors = authors or [user]
+        return Post.objects.bulk_create(
+            Post(
+                name=name.format(number=number),
+                text=text.format(number=number),
+                author=authors[number % len(authors)],
+                is_published=(
+                    is_published(number) if callable(is_published)
+                    else is_published
+                ),
+            )
+            for number in range(count)
+        )
+
+    return make_posts
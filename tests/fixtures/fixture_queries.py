@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+QUERY_BUDGETS = {
+    'api:api_posts': 3,
+    'api:api_posts_detail': 3,
+}
+
+
+@pytest.fixture
+def assert_query_budget():
+    """
+    Контекстный менеджер, проверяющий, что запрос к эндпоинту укладывается
+    в бюджет SQL-запросов из QUERY_BUDGETS.
+    """
+    @contextmanager
+    def _assert_query_budget(url_name):
+        budget = QUERY_BUDGETS[url_name]
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        assert len(context) <= budget, (
+            f'Эндпоинт `{url_name}` выполнил {len(context)} SQL-запросов '
+            f'при бюджете {budget}:\n{queries}'
+        )
+    return _assert_query_budget
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(params=('sync', 'async'))
+def api_urlconf(request, settings):
+    """Прогоняет тест с синхронными и асинхронными вью постов."""
+    if request.param == 'async':
+        settings.ROOT_URLCONF = 'tests.async_urls'
+    return request.param
@@ -30,21 +30,28 @@ def super_user(django_user_model, password):
     )
 
 
-@pytest.fixture
-def user_client(user, password):
-    client = APIClient()
+def basic_credentials(username, password):
     credentials = base64.b64encode(
-        f"{user.username}:{password}".encode('utf-8')
+        f"{username}:{password}".encode('utf-8')
     ).decode('utf-8')
-    client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+    return f"Basic {credentials}"
+
+
+def token_client(username, password):
+    client = APIClient()
+    response = client.post(
+        '/auth/token/',
+        HTTP_AUTHORIZATION=basic_credentials(username, password),
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
     return client
 
 
+@pytest.fixture
+def user_client(user, password):
+    return token_client(user.username, password)
+
+
 @pytest.fixture
 def superuser_client(super_user, password):
-    client = APIClient()
-    credentials = base64.b64encode(
-        f"{super_user.username}:{password}".encode('utf-8')
-    ).decode('utf-8')
-    client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
-    return client
+    return token_client(super_user.username, password)
@@ -0,0 +1,147 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from rest_framework.authtoken.models import Token
+
+from api.async_views import aapi_posts, aapi_posts_detail
+from posts.models import Post
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user).key
+
+
+@pytest.fixture
+def another_token(another_user):
+    return Token.objects.create(user=another_user).key
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+
+    factory = AsyncRequestFactory()
+    VALID_DATA = {'name': 'Новый пост', 'text': 'Текст нового поста'}
+
+    def call(self, view, method, path, token=None, data=None, **kwargs):
+        options = {}
+        if token:
+            options['headers'] = {'Authorization': f'Token {token}'}
+        if data is not None:
+            options['data'] = json.dumps(data)
+            options['content_type'] = 'application/json'
+        request = getattr(self.factory, method)(path, **options)
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_list_matches_sync_view(self, client, post):
+        post.is_published = True
+        post.save()
+        response = self.call(aapi_posts, 'get', '/posts/')
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.content) == client.get('/posts/').json()
+
+    def test_list_filters(self, post, token):
+        response = self.call(
+            aapi_posts, 'get', '/posts/?is_published=false', token=token
+        )
+        assert [
+            item['id'] for item in json.loads(response.content)['results']
+        ] == [post.id], (
+            'Проверьте, что асинхронная версия списка постов поддерживает '
+            'фильтры.'
+        )
+        response = self.call(aapi_posts, 'get', '/posts/?ordering=name')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'ordering' in json.loads(response.content)
+
+    def test_detail(self, client, post):
+        response = self.call(
+            aapi_posts_detail, 'get', f'/posts/{post.id}/', pk=post.id
+        )
+        assert response.content == client.get(f'/posts/{post.id}/').content
+
+    def test_detail_not_found(self):
+        response = self.call(aapi_posts_detail, 'get', '/posts/0/', pk=0)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_create(self, user, token):
+        response = self.call(
+            aapi_posts, 'post', '/posts/', token=token, data=self.VALID_DATA
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.content)
+        assert data['author'] == user.username
+        assert Post.objects.filter(id=data['id'], author=user).exists()
+
+    def test_create_invalid(self, token):
+        response = self.call(
+            aapi_posts, 'post', '/posts/', token=token, data={'name': 'Пост'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('token_value', (None, 'invalid'))
+    def test_create_unauthorized(self, token_value):
+        response = self.call(
+            aapi_posts, 'post', '/posts/', token=token_value,
+            data=self.VALID_DATA
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not Post.objects.exists()
+
+    def test_update(self, post, token):
+        response = self.call(
+            aapi_posts_detail, 'patch', f'/posts/{post.id}/', token=token,
+            data={'text': 'Измененный текст'}, pk=post.id
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.text == 'Измененный текст'
+
+    def test_update_not_author(self, post, another_token):
+        response = self.call(
+            aapi_posts_detail, 'put', f'/posts/{post.id}/',
+            token=another_token, data={'text': 'Чужой текст'}, pk=post.id
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        post.refresh_from_db()
+        assert post.text != 'Чужой текст'
+
+    def test_update_if_match(self, post, token):
+        request = self.factory.patch(
+            f'/posts/{post.id}/',
+            data=json.dumps({'text': 'Измененный текст'}),
+            content_type='application/json',
+            headers={
+                'Authorization': f'Token {token}',
+                'If-Match': f'"{post.version + 1}-0"',
+            },
+        )
+        response = async_to_sync(aapi_posts_detail)(request, pk=post.id)
+        assert response.status_code == HTTPStatus.PRECONDITION_FAILED, (
+            'Проверьте, что асинхронная версия проверяет If-Match.'
+        )
+        post.refresh_from_db()
+        assert post.text != 'Измененный текст'
+
+    def test_delete(self, post, token):
+        response = self.call(
+            aapi_posts_detail, 'delete', f'/posts/{post.id}/', token=token,
+            pk=post.id
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Post.objects.filter(id=post.id).exists()
+
+    def test_method_not_allowed(self):
+        response = self.call(aapi_posts, 'delete', '/posts/')
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    def test_session_authentication(self, client, settings, post):
+        settings.ROOT_URLCONF = 'tests.async_urls'
+        client.force_login(post.author)
+        response = client.get('/posts/?is_published=false')
+        assert [item['id'] for item in response.json()['results']] == [
+            post.id
+        ], 'Проверьте, что асинхронная версия принимает сессию Django.'
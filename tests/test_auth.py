@@ -0,0 +1,81 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from tests.fixtures.fixture_user import basic_credentials
+
+
+@pytest.mark.django_db
+class TestTokenAuth:
+
+    token_url = '/auth/token/'
+    post_list_url = '/posts/'
+    data = {'name': 'Новый пост', 'text': 'Текст нового поста'}
+
+    def test_token_exchange(self, client, user, password):
+        response = client.post(
+            self.token_url,
+            HTTP_AUTHORIZATION=basic_credentials(user.username, password),
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.token_url}` с HTTP Basic '
+            'аутентификацией возвращает ответ со статусом 200.'
+        )
+        assert response.json()['token'] == Token.objects.get(user=user).key
+
+    def test_token_exchange_wrong_password(self, client, user):
+        response = client.post(
+            self.token_url,
+            HTTP_AUTHORIZATION=basic_credentials(user.username, 'wrong'),
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что POST-запрос к `{self.token_url}` с неверным '
+            'паролем возвращает ответ со статусом 401.'
+        )
+
+    def test_basic_auth_not_accepted_by_api(self, user, password):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=basic_credentials(user.username, password)
+        )
+        response = client.post(self.post_list_url, data=self.data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что HTTP Basic используется только для получения '
+            'токена и не принимается эндпоинтами постов.'
+        )
+
+    def test_cached_token_skips_database(self, user_client):
+        user_client.get(self.post_list_url)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(self.post_list_url)
+        assert not any(
+            'authtoken_token' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что повторная аутентификация по токену берет токен '
+            'из кэша, не обращаясь к базе данных.'
+        )
+
+    def test_invalid_token(self, post):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        response = client.post(self.post_list_url, data=self.data)
+        assert response.status_code in (
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+        )
+
+    def test_token_revoke(self, user_client):
+        response = user_client.delete(self.token_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+        response = user_client.post(self.post_list_url, data=self.data)
+        assert response.status_code in (
+            HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+        ), (
+            'Проверьте, что после отзыва токена он больше не принимается, '
+            'в том числе из кэша.'
+        )
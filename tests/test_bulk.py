@@ -0,0 +1,165 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+
+@pytest.mark.django_db
+class TestPostsBulk:
+
+    bulk_url = '/posts/bulk/'
+
+    def test_bulk_create(self, user_client, user):
+        data = [
+            {'name': f'Пост {number}', 'text': f'Текст {number}'}
+            for number in range(50)
+        ]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос со списком постов к '
+            f'`{self.bulk_url}` '
+            'возвращает ответ со статусом 201.'
+        )
+        assert Post.objects.filter(author=user).count() == len(data)
+        assert [post['name'] for post in response.json()] == [
+            item['name'] for item in data
+        ]
+        assert all(post['author'] == user.username
+                   for post in response.json())
+
+    def test_bulk_create_query_count(self, user_client,
+                                     django_assert_max_num_queries):
+        data = [
+            {'name': f'Пост {number}', 'text': f'Текст {number}'}
+            for number in range(100)
+        ]
+        with django_assert_max_num_queries(6):
+            user_client.post(self.bulk_url, data=data, format='json')
+
+    def test_bulk_create_conflicts(self, user_client, post):
+        data = [
+            {'name': 'Новый пост', 'text': 'Текст'},
+            {'name': post.name, 'text': 'Текст'},
+            {'name': 'Новый пост', 'text': 'Текст'},
+        ]
+        posts_count = Post.objects.count()
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'name' in errors[1], (
+            'Проверьте, что конфликт с существующим постом автора '
+            'сообщается для соответствующего элемента списка.'
+        )
+        assert 'name' in errors[2], (
+            'Проверьте, что повтор названия внутри пакета сообщается для '
+            'соответствующего элемента списка.'
+        )
+        assert posts_count == Post.objects.count(), (
+            'Проверьте, что при ошибках пакет постов не сохраняется целиком.'
+        )
+
+    def test_bulk_create_item_errors(self, user_client):
+        data = [{'name': 'Пост', 'text': 'Текст'}, {'name': 'Без текста'}]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()[0] == {}
+        assert 'text' in response.json()[1]
+
+    def test_bulk_create_too_many(self, user_client, settings):
+        settings.BULK_MAX_ITEMS = 2
+        data = [{'name': f'Пост {n}', 'text': 'Текст'} for n in range(3)]
+        response = user_client.post(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_bulk_unauthorized(self):
+        response = APIClient().post(
+            self.bulk_url, data=[{'name': 'Пост', 'text': 'Текст'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_bulk_update(self, user_client, post):
+        second = Post.objects.create(
+            name='Пост 3', text='Текст', author=post.author
+        )
+        data = [
+            {'id': post.id, 'is_published': True},
+            {'id': second.id, 'name': 'Новое название'},
+        ]
+        response = user_client.patch(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        second.refresh_from_db()
+        assert post.is_published
+        assert second.name == 'Новое название'
+        assert second.updated > second.created
+
+    def test_bulk_update_rename_conflict(self, user_client, post):
+        second = Post.objects.create(
+            name='Пост 3', text='Текст', author=post.author
+        )
+        data = [{'id': second.id, 'name': post.name}]
+        response = user_client.patch(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'name' in response.json()[0]
+
+    def test_bulk_update_swap_names(self, user_client, post):
+        second = Post.objects.create(
+            name='Пост 3', text='Текст', author=post.author
+        )
+        data = [
+            {'id': post.id, 'name': 'Временное'},
+            {'id': second.id, 'name': post.name},
+        ]
+        response = user_client.patch(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_bulk_update_not_author(self, user_client, post, another_post):
+        data = [
+            {'id': post.id, 'text': 'Новый текст'},
+            {'id': another_post.id, 'text': 'Новый текст'},
+        ]
+        response = user_client.patch(self.bulk_url, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакетное изменение чужого поста возвращает '
+            'ответ со статусом 403.'
+        )
+        assert response.json()[0] == {}
+        assert 'id' in response.json()[1]
+        post.refresh_from_db()
+        assert post.text != 'Новый текст'
+
+    def test_bulk_update_by_superuser(self, superuser_client, post):
+        data = [{'id': post.id, 'text': 'Новый текст'}]
+        response = superuser_client.patch(
+            self.bulk_url, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.text == 'Новый текст'
+
+    def test_bulk_delete(self, user_client, post):
+        response = user_client.delete(
+            self.bulk_url, data=[post.id], format='json'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Post.objects.filter(id=post.id).exists()
+
+    def test_bulk_delete_not_author(self, user_client, post, another_post):
+        response = user_client.delete(
+            self.bulk_url, data=[post.id, another_post.id], format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert Post.objects.filter(
+            id__in=[post.id, another_post.id]
+        ).count() == 2
+
+    def test_bulk_delete_missing(self, user_client, post):
+        response = user_client.delete(
+            self.bulk_url, data=[post.id, 0], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Post.objects.filter(id=post.id).exists()
@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Post
+
+
+@pytest.fixture
+def published_post(post):
+    post.is_published = True
+    post.save()
+    return post
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('api_urlconf')
+class TestPostsCache:
+
+    post_list_url = '/posts/'
+    post_detail_url = '/posts/{post_id}/'
+
+    def get_names(self, client):
+        response = client.get(self.post_list_url)
+        return [post['name'] for post in response.json()['results']]
+
+    @pytest.mark.parametrize('url', (post_list_url, post_detail_url))
+    def test_anonymous_get_is_cached(self, client, published_post, url):
+        url = url.format(post_id=published_post.id)
+        first = client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(url)
+
+        assert second.json() == first.json()
+        assert len(context) == 0, (
+            f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+            'отдается из кэша без обращения к базе данных.'
+        )
+
+    def test_authorized_get_is_not_cached(self, user_client, published_post):
+        user_client.get(self.post_list_url)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(self.post_list_url)
+        assert len(context) > 0
+
+    def test_api_write_invalidates_cache(self, client, user_client,
+                                         published_post,
+                                         django_capture_on_commit_callbacks):
+        assert self.get_names(client) == [published_post.name]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.patch(
+                self.post_detail_url.format(post_id=published_post.id),
+                data={'name': 'Новое название'},
+            )
+        assert self.get_names(client) == ['Новое название'], (
+            'Проверьте, что PATCH-запрос сбрасывает кэш ленты постов.'
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.delete(
+                self.post_detail_url.format(post_id=published_post.id)
+            )
+        assert self.get_names(client) == [], (
+            'Проверьте, что DELETE-запрос сбрасывает кэш ленты постов.'
+        )
+
+    def test_admin_delete_invalidates_cache(
+        self, client, super_user, published_post,
+        django_capture_on_commit_callbacks
+    ):
+        assert self.get_names(client) == [published_post.name]
+
+        client.force_login(super_user)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                f'/admin/posts/post/{published_post.id}/delete/',
+                data={'post': 'yes'},
+            )
+        assert response.status_code == HTTPStatus.FOUND
+        assert not Post.objects.filter(id=published_post.id).exists()
+        client.logout()
+
+        assert self.get_names(client) == [], (
+            'Проверьте, что удаление поста через админку сбрасывает кэш '
+            'ленты постов.'
+        )
+
+    def test_admin_bulk_delete_invalidates_cache(
+        self, client, super_user, published_post,
+        django_capture_on_commit_callbacks
+    ):
+        assert self.get_names(client) == [published_post.name]
+
+        client.force_login(super_user)
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(
+                '/admin/posts/post/',
+                data={
+                    'action': 'delete_selected',
+                    '_selected_action': [published_post.id],
+                    'post': 'yes',
+                },
+            )
+        assert not Post.objects.filter(id=published_post.id).exists()
+        client.logout()
+
+        assert self.get_names(client) == [], (
+            'Проверьте, что удаление постов действием админки сбрасывает '
+            'кэш ленты постов.'
+        )
+
+    def test_author_delete_invalidates_cache(
+        self, client, user, published_post,
+        django_capture_on_commit_callbacks
+    ):
+        assert self.get_names(client) == [published_post.name]
+        with django_capture_on_commit_callbacks(execute=True):
+            user.delete()
+        assert self.get_names(client) == [], (
+            'Проверьте, что удаление автора вместе с его постами '
+            'сбрасывает кэш ленты постов.'
+        )
+
+    def test_author_rename_invalidates_cache(
+        self, client, user, published_post,
+        django_capture_on_commit_callbacks
+    ):
+        url = self.post_detail_url.format(post_id=published_post.id)
+        client.get(self.post_list_url)
+        client.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            user.username = 'RenamedUser'
+            user.save()
+        assert client.get(self.post_list_url).json()['results'][0][
+            'author'
+        ] == 'RenamedUser', (
+            'Проверьте, что смена имени автора сбрасывает кэш ленты постов.'
+        )
+        assert client.get(url).json()['author'] == 'RenamedUser'
+
+    def test_login_keeps_cache(self, client, user, password, published_post,
+                               django_capture_on_commit_callbacks):
+        client.get(self.post_list_url)
+        with django_capture_on_commit_callbacks() as callbacks:
+            client.login(username=user.username, password=password)
+        assert not callbacks, (
+            'Проверьте, что сохранение пользователя без смены имени '
+            'не сбрасывает кэш постов.'
+        )
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from posts.models import Post, PostChange
+
+
+@pytest.mark.django_db
+class TestPostChanges:
+
+    changes_url = '/posts/changes/'
+    post_list_url = '/posts/'
+
+    def get_changes(self, client, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = client.get(self.changes_url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_feed(self, client, user_client, user):
+        response = user_client.post(
+            self.post_list_url,
+            {'name': 'Пост', 'text': 'Текст', 'is_published': True},
+        )
+        post_id = response.json()['id']
+        data = self.get_changes(client)
+        assert [
+            (change['post_id'], change['action'], change['version'])
+            for change in data['results']
+        ] == [(post_id, 'created', 1)]
+        assert data['results'][0]['post']['name'] == 'Пост'
+        assert data['has_more'] is False
+        cursor = data['cursor']
+
+        user_client.patch(
+            f'{self.post_list_url}{post_id}/', {'text': 'Новый текст'}
+        )
+        user_client.delete(f'{self.post_list_url}{post_id}/')
+        data = self.get_changes(client, cursor)
+        assert [
+            (change['post_id'], change['action'], change['post'])
+            for change in data['results']
+        ] == [(post_id, 'updated', None), (post_id, 'deleted', None)], (
+            f'Проверьте, что `{self.changes_url}` с курсором возвращает '
+            'только изменения после курсора в порядке записи, а удаление '
+            'поста отдается записью `deleted`.'
+        )
+
+        data = self.get_changes(client, data['cursor'])
+        assert data['results'] == [] and data['cursor'], (
+            'Проверьте, что при отсутствии новых изменений курсор '
+            'сохраняется.'
+        )
+
+    def test_bulk_and_admin_writes(self, client, user, super_user):
+        posts = Post.objects.bulk_create(
+            Post(name=f'Пост {number}', text='Текст', author=user)
+            for number in range(3)
+        )
+        Post.objects.filter(pk=posts[0].pk).update(is_published=True)
+        client.force_login(super_user)
+        response = client.post(
+            f'/admin/posts/post/{posts[1].pk}/delete/', data={'post': 'yes'}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+        client.logout()
+
+        actions = [
+            (change['post_id'], change['action'])
+            for change in self.get_changes(client)['results']
+        ]
+        assert actions == [
+            *((post.pk, 'created') for post in posts),
+            (posts[0].pk, 'updated'),
+            (posts[1].pk, 'deleted'),
+        ], (
+            'Проверьте, что журнал изменений пополняется пакетными '
+            'операциями и изменениями через админку.'
+        )
+
+    def test_drafts_are_hidden(self, client, post):
+        change, = self.get_changes(client)['results']
+        assert change['post'] is None, (
+            'Проверьте, что журнал не раскрывает содержимое черновиков.'
+        )
+
+    def test_pages(self, client, user):
+        Post.objects.bulk_create(
+            Post(name=f'Пост {number}', text='Текст', author=user)
+            for number in range(5)
+        )
+        seen = []
+        data = self.get_changes(client, page_size=2)
+        seen.extend(change['post_id'] for change in data['results'])
+        while data['has_more']:
+            data = self.get_changes(client, data['cursor'], page_size=2)
+            seen.extend(change['post_id'] for change in data['results'])
+        assert seen == list(
+            Post.objects.order_by('id').values_list('id', flat=True)
+        )
+
+    def test_rolled_back_writes_are_not_logged(self, user):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Post.objects.create(name='Пост', text='Текст', author=user)
+                raise RuntimeError
+        assert not PostChange.objects.exists(), (
+            'Проверьте, что запись в журнал выполняется в той же '
+            'транзакции, что и изменение поста.'
+        )
+
+    @pytest.mark.parametrize(
+        'cursor', ('garbage', 'eyJyIjowLCJwIjpbbnVsbCxudWxsXX0=')
+    )
+    def test_invalid_cursor(self, client, cursor):
+        response = client.get(self.changes_url, {'since': cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_query_count(self, client, user, django_assert_max_num_queries):
+        Post.objects.bulk_create(
+            Post(name=f'Пост {number}', text='Текст', author=user)
+            for number in range(30)
+        )
+        with django_assert_max_num_queries(2):
+            self.get_changes(client)
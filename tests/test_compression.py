@@ -0,0 +1,114 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from api.renderers import ORJSONRenderer
+
+
+@pytest.fixture
+def many_posts(make_posts):
+    return make_posts(20, text='Повторяющийся текст поста. ' * 20)
+
+
+@pytest.mark.django_db
+class TestCompression:
+
+    post_list_url = '/posts/'
+
+    def test_gzip(self, client, many_posts):
+        plain = client.get(self.post_list_url)
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большие ответы API сжимаются gzip, если клиент '
+            'его поддерживает.'
+        )
+        assert gzip.decompress(response.content) == plain.content
+        assert len(response.content) < len(plain.content) / 3
+        assert 'Accept-Encoding' in response['Vary']
+
+    def test_brotli(self, client, many_posts):
+        brotli = pytest.importorskip('brotli')
+        plain = client.get(self.post_list_url)
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        assert response['Content-Encoding'] == 'br', (
+            'Проверьте, что при наличии пакета brotli он предпочтительнее '
+            'gzip.'
+        )
+        assert brotli.decompress(response.content) == plain.content
+
+    @pytest.mark.parametrize('accept_encoding', ('', 'gzip;q=0', 'deflate'))
+    def test_not_accepted(self, client, many_posts, accept_encoding):
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING=accept_encoding
+        )
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответ не сжимается, если клиент не принимает '
+            'поддерживаемых кодировок.'
+        )
+
+    def test_small_response_is_not_compressed(self, client, post):
+        response = client.get(
+            f'/posts/{post.id}/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше COMPRESSION_MIN_SIZE '
+            'не сжимаются.'
+        )
+
+    def test_streaming_export(self, many_posts):
+        client = APIClient()
+        plain = b''.join(
+            client.get('/posts/export/?format=ndjson').streaming_content
+        )
+        response = client.get(
+            '/posts/export/?format=ndjson', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(b''.join(response.streaming_content)) == (
+            plain
+        ), 'Проверьте, что потоковая выгрузка сжимается по частям.'
+
+    def test_streaming_export_brotli(self, many_posts):
+        brotli = pytest.importorskip('brotli')
+        client = APIClient()
+        plain = b''.join(
+            client.get('/posts/export/?format=csv').streaming_content
+        )
+        response = client.get(
+            '/posts/export/?format=csv', HTTP_ACCEPT_ENCODING='br'
+        )
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(b''.join(response.streaming_content)) == (
+            plain
+        )
+
+    def test_conditional_get_with_compression(self, client, many_posts):
+        response = client.get(
+            self.post_list_url, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        etag = response['ETag']
+        assert etag.startswith('W/'), (
+            'Проверьте, что ETag сжатого ответа становится слабым.'
+        )
+        response = client.get(
+            self.post_list_url,
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_default_renderer(self, user_client):
+        response = user_client.post(
+            '/posts/bulk/', [{'name': 'Пост', 'text': 'Текст'}],
+            format='json',
+        )
+        assert isinstance(response.accepted_renderer, ORJSONRenderer), (
+            'Проверьте, что ORJSONRenderer используется по умолчанию '
+            'во всех вью API.'
+        )
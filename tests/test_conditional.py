@@ -0,0 +1,246 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from posts.models import Post
+from tests.fixtures.fixture_user import token_client
+
+
+@pytest.fixture
+def published_post(post):
+    post.is_published = True
+    post.save()
+    return post
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('api_urlconf')
+class TestConditionalGet:
+
+    post_list_url = '/posts/'
+    post_detail_url = '/posts/{post_id}/'
+
+    @pytest.mark.parametrize('url', (post_list_url, post_detail_url))
+    def test_etag_not_modified(self, client, published_post, url):
+        url = url.format(post_id=published_post.id)
+        response = client.get(url)
+        etag = response.headers.get('ETag')
+        assert etag and not etag.startswith('W/'), (
+            f'Проверьте, что ответ `{url}` содержит строгий ETag.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            'If-None-Match возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+
+    def test_if_modified_since(self, client, published_post):
+        url = self.post_detail_url.format(post_id=published_post.id)
+        last_modified = client.get(url).headers.get('Last-Modified')
+        assert last_modified, (
+            f'Проверьте, что ответ `{url}` содержит заголовок Last-Modified.'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_list_after_delete(self, client, user_client, user,
+                               published_post,
+                               django_capture_on_commit_callbacks):
+        Post.objects.create(
+            name='Второй пост', text='Текст', author=user, is_published=True
+        )
+        response = client.get(self.post_list_url)
+        etag = response.headers['ETag']
+        assert 'Last-Modified' not in response.headers, (
+            'Проверьте, что лента не отдает Last-Modified: удаление поста '
+            'не меняет время изменения оставшихся.'
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.delete(
+                self.post_detail_url.format(post_id=published_post.id)
+            )
+        response = client.get(self.post_list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления опубликованного поста лента '
+            'с устаревшим If-None-Match возвращает ответ со статусом 200.'
+        )
+
+    @pytest.mark.parametrize('url', (post_list_url, post_detail_url))
+    def test_etag_changes_after_edit(self, client, user_client,
+                                     published_post, url,
+                                     django_capture_on_commit_callbacks):
+        url = url.format(post_id=published_post.id)
+        etag = client.get(url).headers['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.patch(
+                self.post_detail_url.format(post_id=published_post.id),
+                data={'text': 'Новый текст'},
+            )
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения поста `{url}` с устаревшим '
+            'If-None-Match возвращает ответ со статусом 200.'
+        )
+        assert response.headers['ETag'] != etag
+
+    @pytest.mark.parametrize('url', (post_list_url, post_detail_url))
+    def test_validators_change_after_author_rename(
+        self, client, user, published_post, url,
+        django_capture_on_commit_callbacks
+    ):
+        # Last-Modified передается с точностью до секунды.
+        Post.objects.filter(pk=published_post.id).update(
+            updated=timezone.now() - timedelta(minutes=1)
+        )
+        url = url.format(post_id=published_post.id)
+        response = client.get(url)
+        etag = response.headers['ETag']
+        last_modified = response.headers.get('Last-Modified')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.username = 'RenamedUser'
+            user.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после смены имени автора `{url}` с устаревшим '
+            'If-None-Match возвращает ответ со статусом 200.'
+        )
+        assert 'RenamedUser' in response.content.decode()
+        if last_modified:
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что после смены имени автора `{url}` '
+                'с устаревшим If-Modified-Since возвращает ответ со '
+                'статусом 200.'
+            )
+
+    def test_missing_post(self, client):
+        response = client.get(self.post_detail_url.format(post_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert 'ETag' not in response.headers
+
+    def test_drafts_after_edit(self, client, user_client, post,
+                               django_capture_on_commit_callbacks):
+        drafts_url = f'{self.post_list_url}?is_published=false'
+        etag = client.get(self.post_list_url).headers['ETag']
+        response = user_client.get(drafts_url)
+        assert 'ETag' not in response.headers, (
+            'Проверьте, что запрос черновиков не получает ETag: '
+            'состояние ленты общее для всех пользователей.'
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.patch(
+                self.post_detail_url.format(post_id=post.id),
+                data={'text': 'Новый текст'},
+            )
+        response = user_client.get(drafts_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения черновика запрос черновиков '
+            'с If-None-Match возвращает ответ со статусом 200.'
+        )
+        assert response.json()['results'][0]['text'] == 'Новый текст'
+
+    def test_drafts_of_another_user(self, user_client, another_user,
+                                    password, post, another_post):
+        drafts_url = f'{self.post_list_url}?is_published=false'
+        user_client.get(self.post_list_url)
+        user_client.get(drafts_url)
+
+        # «*» совпадает с любым ETag, в том числе полученным другим
+        # пользователем по тому же адресу.
+        another_client = token_client(another_user.username, password)
+        response = another_client.get(drafts_url, HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что состояние ленты, закэшированное для одного '
+            'пользователя, не дает ответ 304 на запрос черновиков другого.'
+        )
+        assert [item['id'] for item in response.json()['results']] == [
+            another_post.id
+        ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('api_urlconf')
+class TestConditionalWrite:
+
+    post_detail_url = '/posts/{post_id}/'
+
+    def get_etag(self, client, post):
+        return client.get(
+            self.post_detail_url.format(post_id=post.id)
+        ).headers['ETag']
+
+    def test_if_match(self, user_client, post,
+                      django_capture_on_commit_callbacks):
+        url = self.post_detail_url.format(post_id=post.id)
+        etag = self.get_etag(user_client, post)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = user_client.patch(
+                url, {'text': 'Первая правка'}, HTTP_IF_MATCH=etag
+            )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что PATCH-запрос с актуальным If-Match '
+            'выполняется.'
+        )
+        assert response.json()['version'] == post.version + 1
+        assert response.headers['ETag'] == self.get_etag(user_client, post), (
+            'Проверьте, что ответ на изменение содержит новый ETag поста.'
+        )
+
+        response = user_client.patch(
+            url, {'text': 'Вторая правка'}, HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.PRECONDITION_FAILED, (
+            'Проверьте, что PATCH-запрос с устаревшим If-Match '
+            'возвращает ответ со статусом 412.'
+        )
+        post.refresh_from_db()
+        assert post.text == 'Первая правка'
+
+        response = user_client.delete(url, HTTP_IF_MATCH=etag)
+        assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+        assert Post.objects.filter(pk=post.id).exists()
+
+    @pytest.mark.parametrize('header', ('*', 'W/{etag}', '"0-x", {etag}'))
+    def test_if_match_variants(self, user_client, post, header):
+        url = self.post_detail_url.format(post_id=post.id)
+        header = header.format(etag=self.get_etag(user_client, post))
+        response = user_client.delete(url, HTTP_IF_MATCH=header)
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что If-Match принимает «*», слабый ETag сжатого '
+            'ответа и список ETag.'
+        )
+
+    def test_if_match_keeps_403_and_404(self, user_client, another_user,
+                                        password, post):
+        etag = self.get_etag(user_client, post)
+        another_client = token_client(another_user.username, password)
+        response = another_client.patch(
+            self.post_detail_url.format(post_id=post.id),
+            {'text': 'Чужая правка'},
+            HTTP_IF_MATCH=etag,
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = user_client.patch(
+            self.post_detail_url.format(post_id=post.id + 1),
+            {'text': 'Правка'},
+            HTTP_IF_MATCH=etag,
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_save_increments_version(self, post):
+        version = post.version
+        post.text = 'Правка из админки'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        assert post.version == version + 1, (
+            'Проверьте, что сохранение поста увеличивает его версию.'
+        )
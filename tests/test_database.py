@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+import simple_crud_api
+
+from api.signals import apply_sqlite_pragmas
+
+
+def write_burst_read_errors(path, pragmas, commits=100):
+    """
+    Выполняет серию записей в одном потоке и параллельное чтение
+    без ожидания блокировки в другом. Возвращает число чтений, которые
+    завершились ошибкой блокировки, и число успешных чтений.
+    """
+    setup = sqlite3.connect(path, isolation_level=None)
+    apply_sqlite_pragmas(setup.cursor(), pragmas)
+    setup.execute('CREATE TABLE post (id INTEGER PRIMARY KEY, text TEXT)')
+    setup.close()
+
+    finished = threading.Event()
+    started = threading.Event()
+    errors = []
+    reads = []
+
+    def writer():
+        writer_connection = sqlite3.connect(
+            path, isolation_level=None, timeout=5
+        )
+        apply_sqlite_pragmas(writer_connection.cursor(), pragmas)
+        started.wait()
+        for _ in range(commits):
+            writer_connection.execute('BEGIN IMMEDIATE')
+            writer_connection.executemany(
+                'INSERT INTO post (text) VALUES (?)', [('Текст' * 50,)] * 50
+            )
+            writer_connection.execute('COMMIT')
+        finished.set()
+
+    def reader():
+        reader_connection = sqlite3.connect(
+            path, isolation_level=None, timeout=0
+        )
+        started.set()
+        while not finished.is_set():
+            try:
+                reads.append(
+                    reader_connection.execute(
+                        'SELECT COUNT(*) FROM post'
+                    ).fetchone()
+                )
+            except sqlite3.OperationalError:
+                errors.append(1)
+
+    threads = [
+        threading.Thread(target=writer),
+        threading.Thread(target=reader),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(errors), len(reads)
+
+
+class TestDatabaseSettings:
+    @pytest.mark.django_db
+    def test_pragmas_are_applied(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA busy_timeout')
+            busy_timeout = cursor.fetchone()[0]
+        assert synchronous == 1, (
+            'Проверьте, что к соединениям SQLite применяется '
+            '`synchronous=NORMAL`.'
+        )
+        assert (
+            busy_timeout > 0
+        ), 'Проверьте, что для SQLite задан таймаут ожидания блокировки.'
+
+    def test_wal_is_enabled(self, tmp_path):
+        database = sqlite3.connect(tmp_path / 'wal.sqlite3')
+        apply_sqlite_pragmas(database.cursor(), settings.SQLITE_PRAGMAS)
+        mode = database.execute('PRAGMA journal_mode').fetchone()[0]
+        assert (
+            mode == 'wal'
+        ), 'Проверьте, что для файловой базы SQLite включается режим WAL.'
+
+    def test_reads_are_not_blocked_by_writes(self, tmp_path):
+        errors, reads = write_burst_read_errors(
+            tmp_path / 'wal.sqlite3', settings.SQLITE_PRAGMAS
+        )
+        assert reads > 0
+        assert errors == 0, (
+            'Проверьте, что в режиме WAL чтение не блокируется '
+            f'серией записей: {errors} чтений завершились ошибкой.'
+        )
+
+    def test_rollback_journal_blocks_reads(self, tmp_path):
+        errors, _ = write_burst_read_errors(
+            tmp_path / 'delete.sqlite3', {'journal_mode': 'delete'}
+        )
+        assert errors > 0, (
+            'Без WAL чтение должно блокироваться записью — иначе тест '
+            'выше ничего не проверяет.'
+        )
+
+    @pytest.mark.parametrize('module, conn_max_age', (
+        ('simple_crud_api.asgi', '0'),
+        ('simple_crud_api.wsgi', '60'),
+    ))
+    def test_conn_max_age_default(self, module, conn_max_age):
+        env = {
+            key: value for key, value in os.environ.items()
+            if key not in ('DB_CONN_MAX_AGE', 'DJANGO_SETTINGS_MODULE')
+        }
+        output = subprocess.run(
+            [
+                sys.executable, '-c',
+                f'import {module}; from django.conf import settings; '
+                'print(settings.DATABASES["default"]["CONN_MAX_AGE"])',
+            ],
+            cwd=os.path.dirname(os.path.dirname(simple_crud_api.__file__)),
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        assert output == conn_max_age, (
+            f'Проверьте, что при запуске через `{module}` по умолчанию '
+            f'CONN_MAX_AGE равен {conn_max_age}: под ASGI постоянные '
+            'соединения не переиспользуются.'
+        )
@@ -0,0 +1,180 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api.async_views import aapi_posts_events
+from api.events import get_broker, get_publisher
+from posts.models import Post
+
+
+@pytest.fixture(autouse=True)
+def events_broker(settings):
+    settings.EVENTS_POLL_INTERVAL = 0.01
+    get_broker.cache_clear()
+    get_publisher.cache_clear()
+    yield
+    get_broker.cache_clear()
+    get_publisher.cache_clear()
+
+
+def parse_frame(chunk):
+    fields = dict(
+        line.split(': ', 1) for line in chunk.decode().strip().split('\n')
+    )
+    fields['data'] = json.loads(fields['data'])
+    return fields
+
+
+async def read_frames(stream, count):
+    frames = []
+    while len(frames) < count:
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        if chunk.startswith((b'retry:', b':')):
+            continue
+        frames.append(parse_frame(chunk))
+    return frames
+
+
+@pytest.mark.django_db
+class TestPostEvents:
+
+    events_url = '/posts/events/'
+    factory = AsyncRequestFactory()
+
+    async def open_stream(self, since=None, last_event_id=None):
+        headers = {}
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = last_event_id
+        params = {} if since is None else {'since': since}
+        request = self.factory.get(self.events_url, params, headers=headers)
+        return await aapi_posts_events(request)
+
+    @staticmethod
+    def create_post(user, name, **kwargs):
+        return sync_to_async(Post.objects.create)(
+            name=name, text='Текст', author=user, **kwargs
+        )
+
+    def test_live_events(self, user):
+        async def scenario():
+            response = await self.open_stream()
+            assert response['Content-Type'] == 'text/event-stream'
+            stream = response.streaming_content
+            assert (await anext(stream)).startswith(b'retry:')
+
+            post = await self.create_post(user, 'Пост', is_published=True)
+            post.name = 'Новое название'
+            await sync_to_async(post.save)()
+            frames = await read_frames(stream, 2)
+            post_id = post.pk
+            await sync_to_async(post.delete)()
+            frames += await read_frames(stream, 1)
+            await stream.aclose()
+            return post_id, frames
+
+        post_id, frames = async_to_sync(scenario)()
+        assert [
+            (frame['event'], frame['data']['post_id']) for frame in frames
+        ] == [
+            ('created', post_id),
+            ('updated', post_id),
+            ('deleted', post_id),
+        ], (
+            f'Проверьте, что `{self.events_url}` отдает события создания, '
+            'изменения и удаления постов в порядке фиксации.'
+        )
+        assert frames[1]['data']['post']['name'] == 'Новое название'
+        assert frames[2]['data']['post'] is None
+        assert (
+            not get_broker().has_subscribers()
+        ), 'Проверьте, что закрытый поток отписывается от рассылки.'
+
+    def test_resume(self, client, user):
+        first = Post.objects.create(name='Первый', text='Текст', author=user)
+        cursor = client.get('/posts/changes/').json()['cursor']
+        second = Post.objects.create(name='Второй', text='Текст', author=user)
+        third = Post.objects.create(name='Третий', text='Текст', author=user)
+
+        async def scenario(count, **params):
+            response = await self.open_stream(**params)
+            stream = response.streaming_content
+            frames = await read_frames(stream, count)
+            await stream.aclose()
+            return frames
+
+        frames = async_to_sync(scenario)(2, last_event_id=cursor)
+        assert [frame['data']['post_id'] for frame in frames] == [
+            second.pk,
+            third.pk,
+        ], (
+            'Проверьте, что поток с заголовком Last-Event-ID дочитывает '
+            'изменения после него из журнала.'
+        )
+        (resumed,) = async_to_sync(scenario)(1, since=frames[0]['id'])
+        assert resumed['id'] == frames[1]['id'], (
+            'Проверьте, что параметр since продолжает поток после '
+            'переданного курсора.'
+        )
+        assert first.pk not in {frame['data']['post_id'] for frame in frames}
+
+    def test_overflow_falls_back_to_log(self, settings, user):
+        settings.EVENTS_BUFFER_SIZE = 2
+
+        async def scenario():
+            response = await self.open_stream()
+            stream = response.streaming_content
+            await anext(stream)
+            posts = [
+                await self.create_post(user, f'Пост {number}')
+                for number in range(5)
+            ]
+            await sync_to_async(get_publisher().publish)()
+            (subscription,) = get_broker().subscriptions
+            assert subscription.lagged and not subscription.events, (
+                'Проверьте, что при переполнении буфер подписки '
+                'очищается, а не растет.'
+            )
+            frames = await read_frames(stream, 5)
+            await stream.aclose()
+            return posts, frames
+
+        posts, frames = async_to_sync(scenario)()
+        assert [frame['data']['post_id'] for frame in frames] == [
+            post.pk for post in posts
+        ], (
+            'Проверьте, что после переполнения буфера поток дочитывает '
+            'пропущенные события из журнала без потерь.'
+        )
+
+    @pytest.mark.parametrize(
+        'cursor', ('garbage', 'eyJyIjowLCJwIjpbbnVsbCxudWxsXX0=')
+    )
+    def test_invalid_cursor(self, cursor):
+        response = async_to_sync(self.open_stream)(last_event_id=cursor)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_writes_do_not_read_log(self, user_client, post,
+                                    django_capture_on_commit_callbacks):
+        get_broker().subscribe(object())
+        with CaptureQueriesContext(connection) as context:
+            with django_capture_on_commit_callbacks(execute=True):
+                user_client.patch(
+                    f'/posts/{post.pk}/', data={'text': 'Новый текст'}
+                )
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "posts_postchange"' in query['sql']
+        ], (
+            'Проверьте, что запись постов не читает журнал изменений: '
+            'рассылку выполняет фоновая задача потока событий.'
+        )
+
+    def test_requires_asgi(self, client):
+        response = client.get(self.events_url)
+        assert response.status_code == HTTPStatus.NOT_IMPLEMENTED
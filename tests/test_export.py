@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from api.serializers import PostSerializer
+from posts.models import Post
+
+
+@pytest.fixture
+def published_posts(make_posts, user, another_user):
+    make_posts(
+        10,
+        text='Текст поста {number}, с "кавычками"\nи переносом',
+        authors=[user, another_user],
+        is_published=lambda number: number % 3 != 0,
+    )
+    return Post.objects.filter(is_published=True).order_by('id')
+
+
+@pytest.mark.django_db
+class TestPostsExport:
+
+    export_url = '/posts/export/'
+
+    def test_ndjson_export(self, client, published_posts):
+        response = client.get(self.export_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.export_url}` отдает ответ потоком.'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+
+        content = b''.join(response.streaming_content).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+        expected = PostSerializer(published_posts, many=True).data
+        assert rows == json.loads(json.dumps(expected)), (
+            'Проверьте, что строки выгрузки совпадают с представлением '
+            'постов в API.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {'format': 'csv'}, {'HTTP_ACCEPT': 'text/csv'}
+    ))
+    def test_csv_export(self, client, published_posts, params):
+        if 'format' in params:
+            response = client.get(self.export_url, data=params)
+        else:
+            response = client.get(self.export_url, **params)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/csv')
+
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [int(row['id']) for row in rows] == [
+            post.id for post in published_posts
+        ]
+        assert rows[0]['text'] == published_posts[0].text
+
+    @pytest.mark.parametrize('params', ({}, {'format': 'csv'}))
+    def test_asgi_export_is_async(self, async_client, client,
+                                  published_posts, params):
+        async def scenario():
+            response = await async_client.get(self.export_url, params)
+            chunks = [chunk async for chunk in response.streaming_content]
+            return response, b''.join(chunks)
+
+        response, content = async_to_sync(scenario)()
+        assert response.is_async, (
+            f'Проверьте, что под ASGI `{self.export_url}` отдает '
+            'асинхронный поток, а не читает выгрузку в память целиком.'
+        )
+        expected = client.get(self.export_url, params)
+        assert content == b''.join(expected.streaming_content)
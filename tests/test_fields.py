@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def published_posts(make_posts):
+    return make_posts(5, text='Длинный текст поста {number}')
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    post_list_url = '/posts/'
+    post_detail_url = '/posts/{post_id}/'
+
+    def get_post_queries(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, response.content
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post"' in query['sql']
+            and 'COUNT' not in query['sql']
+        ]
+        return response.json(), queries
+
+    def test_list_fields(self, client, published_posts):
+        data, queries = self.get_post_queries(
+            client, self.post_list_url, {'fields': 'id,name,author,created'}
+        )
+        assert all(
+            list(post) == ['id', 'author', 'name', 'created']
+            for post in data['results']
+        ), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля в порядке PostSerializer.'
+        )
+        assert queries and all(
+            '"posts_post"."text"' not in sql for sql in queries
+        ), 'Проверьте, что невыбранные поля не читаются из базы.'
+
+    def test_list_omit(self, client, published_posts):
+        data, queries = self.get_post_queries(
+            client, self.post_list_url, {'omit': 'text,author'}
+        )
+        assert list(data['results'][0]) == [
+            'id', 'name', 'created', 'updated', 'is_published', 'version'
+        ], 'Проверьте, что параметр `omit` исключает поля из ответа.'
+        assert all(
+            '"posts_post"."text"' not in sql and 'auth_user' not in sql
+            for sql in queries
+        ), (
+            'Проверьте, что без поля `author` запрос не соединяется '
+            'с таблицей пользователей.'
+        )
+
+    def test_pagination_without_ordering_fields(self, client,
+                                                published_posts):
+        received = []
+        url = f'{self.post_list_url}?fields=name&page_size=2'
+        while url:
+            data = client.get(url).json()
+            received.extend(post['name'] for post in data['results'])
+            url = data['next']
+        assert sorted(received) == sorted(
+            post.name for post in published_posts
+        ), (
+            'Проверьте, что пагинация работает, даже если поля сортировки '
+            'не выбраны в `fields`.'
+        )
+
+    def test_detail_fields(self, client, published_posts):
+        post = published_posts[0]
+        data, queries = self.get_post_queries(
+            client,
+            self.post_detail_url.format(post_id=post.id),
+            {'fields': 'name'},
+        )
+        assert data == {'name': post.name}
+        assert all('"posts_post"."text"' not in sql for sql in queries)
+
+    def test_search_with_fields(self, client, published_posts):
+        response = client.get(
+            self.post_list_url, {'q': 'текст', 'fields': 'id'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(post['id'] for post in response.json()['results']) == (
+            sorted(post.id for post in published_posts)
+        )
+
+    @pytest.mark.parametrize('params', (
+        {'fields': ''},
+        {'fields': ' , '},
+        {'omit': 'id,author,name,text,created,updated,is_published,version'},
+        {'fields': 'id,name', 'omit': 'name,id'},
+    ))
+    @pytest.mark.parametrize('url', (post_list_url, post_detail_url))
+    def test_empty_selection(self, client, published_posts, url, params):
+        url = url.format(post_id=published_posts[0].id)
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пустой выбор полей в `fields` и `omit` '
+            'возвращает ответ со статусом 400.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {'fields': 'id,password'},
+        {'omit': 'secret'},
+    ))
+    def test_unknown_fields(self, client, params):
+        response = client.get(self.post_list_url, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестные поля в `fields` и `omit` '
+            'возвращают ответ со статусом 400.'
+        )
+        assert set(response.json()) == set(params)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from posts.models import Post
+from tests.fixtures.fixture_user import token_client
+
+
+@pytest.fixture
+def dated_posts(user, another_user):
+    now = timezone.now()
+    posts = Post.objects.bulk_create(
+        Post(
+            name=f'Пост {number}',
+            text='Текст',
+            author=user if number % 2 else another_user,
+            is_published=number != 5,
+        )
+        for number in range(6)
+    )
+    for number, post in enumerate(posts):
+        post.created = now - timedelta(days=number)
+        post.updated = now - timedelta(days=10 - number)
+    Post.objects.bulk_update(posts, ['created', 'updated'])
+    return {post.name: post for post in posts}
+
+
+@pytest.mark.django_db
+class TestPostsFilters:
+
+    post_list_url = '/posts/'
+
+    def get_names(self, client, **params):
+        response = client.get(self.post_list_url, params)
+        assert response.status_code == HTTPStatus.OK, response.content
+        return [post['name'] for post in response.json()['results']]
+
+    def test_filter_by_author(self, client, user, dated_posts):
+        assert self.get_names(client, author=user.username) == [
+            'Пост 1', 'Пост 3'
+        ], (
+            'Проверьте, что параметр `author` оставляет только '
+            'опубликованные посты указанного автора.'
+        )
+
+    def test_filter_by_created(self, client, dated_posts):
+        names = self.get_names(
+            client,
+            created__gte=dated_posts['Пост 3'].created.isoformat(),
+            created__lte=dated_posts['Пост 1'].created.isoformat(),
+        )
+        assert names == ['Пост 1', 'Пост 2', 'Пост 3'], (
+            'Проверьте, что параметры `created__gte` и `created__lte` '
+            'включают границы диапазона.'
+        )
+
+    @pytest.mark.parametrize('ordering, expected', (
+        ('created', ['Пост 4', 'Пост 3', 'Пост 2', 'Пост 1', 'Пост 0']),
+        ('-updated', ['Пост 4', 'Пост 3', 'Пост 2', 'Пост 1', 'Пост 0']),
+        ('updated', ['Пост 0', 'Пост 1', 'Пост 2', 'Пост 3', 'Пост 4']),
+    ))
+    def test_ordering(self, client, dated_posts, ordering, expected):
+        assert self.get_names(client, ordering=ordering) == expected, (
+            f'Проверьте сортировку списка постов по `{ordering}`.'
+        )
+
+    def test_ordering_pagination(self, client, dated_posts):
+        received = []
+        url = f'{self.post_list_url}?ordering=updated&page_size=2'
+        while url:
+            data = client.get(url).json()
+            received.extend(post['name'] for post in data['results'])
+            url = data['next']
+        assert received == [f'Пост {number}' for number in range(5)], (
+            'Проверьте, что ссылки `next` сохраняют выбранную сортировку.'
+        )
+
+    def test_own_drafts(self, user_client, another_user, password,
+                        dated_posts):
+        assert self.get_names(user_client, is_published='false') == [
+            'Пост 5'
+        ], 'Проверьте, что `is_published=false` возвращает черновики автора.'
+        another_client = token_client(another_user.username, password)
+        assert self.get_names(another_client, is_published='false') == [], (
+            'Проверьте, что чужие черновики недоступны.'
+        )
+
+    def test_drafts_require_auth(self, client, dated_posts):
+        response = client.get(self.post_list_url, {'is_published': 'false'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что запрос черновиков без авторизации возвращает '
+            'ответ со статусом 403.'
+        )
+
+    @pytest.mark.parametrize('params', (
+        {'ordering': 'name'},
+        {'created__gte': 'вчера'},
+        {'is_published': 'может быть'},
+    ))
+    def test_invalid_params(self, client, params):
+        response = client.get(self.post_list_url, params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неверные параметры фильтрации возвращают '
+            'ответ со статусом 400.'
+        )
+        assert set(response.json()) == set(params)
+
+    @pytest.mark.parametrize('ordering', ('-updated', 'updated'))
+    def test_date_filter_requires_created_ordering(self, client, ordering):
+        response = client.get(
+            self.post_list_url,
+            {'created__gte': '2020-01-01T00:00:00Z', 'ordering': ordering},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что фильтр по дате создания с сортировкой по дате '
+            'изменения, для которой нет индекса, возвращает ответ со '
+            'статусом 400.'
+        )
+        assert set(response.json()) == {'ordering'}
@@ -0,0 +1,49 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestPostIndexes:
+
+    def test_explain_uses_indexes(self, post):
+        out = StringIO()
+        call_command('explain_posts', stdout=out)
+        plans = out.getvalue()
+
+        assert 'post_published_feed_idx' in plans, (
+            'Проверьте, что запрос ленты опубликованных постов использует '
+            'индекс `post_published_feed_idx`.'
+        )
+        assert 'post_author_created_idx' in plans, (
+            'Проверьте, что запрос постов автора использует индекс '
+            '`post_author_created_idx`.'
+        )
+
+    def test_filters_do_not_scan_table(self, post):
+        out = StringIO()
+        call_command('explain_posts', stdout=out)
+        plans = out.getvalue()
+
+        for title in (
+            'api_posts: автор, дата, -created',
+            'api_posts: автор, -updated',
+            'api_posts: черновики, updated',
+        ):
+            assert title in plans, (
+                'Проверьте, что `explain_posts` выводит планы для каждой '
+                'комбинации фильтров и сортировки.'
+            )
+        full_scans = [
+            line for line in plans.splitlines()
+            if line.rstrip().endswith('SCAN posts_post')
+        ]
+        assert not full_scans, (
+            'Проверьте, что ни одна комбинация фильтров и сортировки '
+            '`api_posts` не приводит к полному просмотру таблицы постов.'
+        )
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in plans, (
+            'Проверьте, что каждую комбинацию фильтров и сортировки '
+            '`api_posts` поддерживает индекс без сортировки результата.'
+        )
@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, enqueue, get_retry_delay, run_job
+from posts.models import Post
+
+calls = []
+
+
+def record(**kwargs):
+    calls.append(kwargs)
+
+
+def fail():
+    raise RuntimeError('Сбой задачи')
+
+
+def publish_post(post_id):
+    Post.objects.filter(pk=post_id).update(is_published=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+class TestJobs:
+
+    def enqueue(self, django_capture_on_commit_callbacks, task, **kwargs):
+        with django_capture_on_commit_callbacks(execute=True):
+            enqueue(task, **kwargs)
+        return Job.objects.get()
+
+    def test_enqueue_on_commit(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            enqueue(record, value=1)
+        assert not Job.objects.exists(), (
+            'Проверьте, что задача ставится в очередь только после '
+            'фиксации транзакции.'
+        )
+        for callback in callbacks:
+            callback()
+        job = Job.objects.get()
+        assert job.name == 'tests.test_jobs.record'
+        assert job.payload == {'value': 1}
+
+    def test_rolled_back_jobs_are_dropped(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue(record, value=1)
+                raise RuntimeError
+        assert not Job.objects.exists()
+
+    def test_run(self, django_capture_on_commit_callbacks):
+        job = self.enqueue(
+            django_capture_on_commit_callbacks, 'tests.test_jobs.record',
+            value=1,
+        )
+        assert claim_jobs(10) == [job.pk]
+        assert claim_jobs(10) == [], (
+            'Проверьте, что захваченная задача не выдается повторно.'
+        )
+        run_job(job.pk)
+        assert calls == [{'value': 1}]
+        assert not Job.objects.exists(), (
+            'Проверьте, что выполненная задача удаляется из очереди.'
+        )
+
+    def test_retries_with_backoff(self, settings,
+                                  django_capture_on_commit_callbacks):
+        settings.JOBS_MAX_ATTEMPTS = 3
+        job = self.enqueue(django_capture_on_commit_callbacks, fail)
+        delays = []
+        for _ in range(settings.JOBS_MAX_ATTEMPTS):
+            assert claim_jobs(10) == [job.pk]
+            run_job(job.pk)
+            job.refresh_from_db()
+            delays.append(job.run_after)
+            assert claim_jobs(10) == [], (
+                'Проверьте, что задача с ошибкой не запускается до '
+                'истечения задержки.'
+            )
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == settings.JOBS_MAX_ATTEMPTS
+        assert 'Сбой задачи' in job.last_error
+        assert get_retry_delay(1) < get_retry_delay(2), (
+            'Проверьте, что задержка перед повтором растет с числом попыток.'
+        )
+        assert delays[0] >= job.created + timedelta(
+            seconds=get_retry_delay(1)
+        )
+
+    def test_expired_lease(self, django_capture_on_commit_callbacks):
+        job = self.enqueue(django_capture_on_commit_callbacks, record)
+        claim_jobs(10)
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        assert claim_jobs(10) == [job.pk], (
+            'Проверьте, что задача прерванного обработчика захватывается '
+            'повторно после истечения захвата.'
+        )
+        run_job(job.pk)
+        assert calls == [{}]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_command(user):
+    posts = Post.objects.bulk_create(
+        Post(name=f'Пост {number}', text='Текст', author=user)
+        for number in range(5)
+    )
+    for post in posts:
+        enqueue(publish_post, post_id=post.pk)
+    enqueue(fail)
+
+    # Тестовая база SQLite в памяти с общим кэшем блокирует таблицу
+    # без ожидания, поэтому задачи выполняются по одной.
+    call_command('run_jobs', '--once', '--workers', '1')
+    assert Post.objects.filter(is_published=True).count() == len(posts), (
+        'Проверьте, что команда run_jobs выполняет задачи из очереди.'
+    )
+    assert list(Job.objects.values_list('status', 'attempts')) == [
+        (Job.Status.QUEUED, 1)
+    ], 'Проверьте, что задача с ошибкой остается в очереди для повтора.'
@@ -0,0 +1,105 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api.metrics import registry
+from api.middleware import PerformanceMiddleware
+from posts.models import Post
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def parse_server_timing(header):
+    return {
+        match.group('name'): match.group('rest')
+        for match in re.finditer(
+            r'(?P<name>\w+);dur=(?P<rest>[^,]+)', header
+        )
+    }
+
+
+@pytest.mark.django_db
+class TestPerformanceMetrics:
+
+    post_list_url = '/posts/'
+    metrics_url = '/metrics/'
+
+    def test_server_timing_header(self, user_client, post):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        timing = parse_server_timing(response['Server-Timing'])
+        assert {'total', 'db', 'serializer', 'render'} <= set(timing), (
+            'Проверьте, что заголовок `Server-Timing` содержит этапы '
+            'total, db, serializer и render.'
+        )
+        assert f'desc="{len(context)} queries"' in timing['db'], (
+            'Проверьте, что в `Server-Timing` указано число SQL-запросов, '
+            'выполненных при обработке запроса.'
+        )
+
+    def test_metrics_endpoint(self, client, post):
+        Post.objects.update(is_published=True)
+        client.get(self.post_list_url)
+        client.get(f'/posts/{post.id}/')
+        client.get(f'/posts/{post.id}/')
+
+        response = client.get(self.metrics_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что показатели отдаются в текстовом формате '
+            'Prometheus.'
+        )
+        body = response.content.decode()
+        assert (
+            'api_requests_total{view="api:api_posts_detail",method="GET",'
+            'status="200"} 2'
+        ) in body, (
+            'Проверьте, что число запросов считается по имени URL, методу '
+            'и статусу ответа.'
+        )
+        for name in (
+            'api_request_duration_seconds',
+            'api_db_queries',
+            'api_db_duration_seconds',
+            'api_serializer_duration_seconds',
+            'api_response_size_bytes',
+        ):
+            assert (
+                f'{name}_count{{view="api:api_posts",method="GET"}} 1'
+            ) in body, (
+                f'Проверьте, что гистограмма `{name}` собирается для '
+                '`api:api_posts`.'
+            )
+        assert (
+            'api_db_queries_bucket{view="api:api_posts",method="GET",'
+            'le="+Inf"} 1'
+        ) in body
+
+    def test_metrics_endpoint_is_read_only(self, client):
+        response = client.post(self.metrics_url)
+        assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    def test_async_middleware(self):
+        async def get_response(request):
+            return HttpResponse(b'{}')
+
+        middleware = PerformanceMiddleware(get_response)
+        response = async_to_sync(middleware)(RequestFactory().get('/'))
+        assert 'total;dur=' in response['Server-Timing'], (
+            'Проверьте, что middleware работает в асинхронном стеке.'
+        )
+        assert 'api_requests_total{view="unmatched",method="GET"' in (
+            registry.render()
+        )
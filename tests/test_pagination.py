@@ -0,0 +1,90 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from posts.models import Post
+
+
+@pytest.fixture
+def published_posts(make_posts):
+    make_posts(25)
+    now = timezone.now()
+    posts = list(Post.objects.order_by('id'))
+    for number, post in enumerate(posts):
+        post.created = now - timedelta(minutes=number // 3)
+    Post.objects.bulk_update(posts, ['created'])
+    return Post.objects.order_by('-created', '-id')
+
+
+@pytest.mark.django_db
+class TestPostsPagination:
+
+    post_list_url = '/posts/'
+
+    def test_walk_all_pages(self, client, published_posts):
+        expected = [post.id for post in published_posts]
+        received = []
+        url = f'{self.post_list_url}?page_size=4'
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert len(data['results']) <= 4, (
+                'Проверьте, что размер страницы не превышает `page_size`.'
+            )
+            received.extend(post['id'] for post in data['results'])
+            url = data['next']
+
+        assert received == expected, (
+            f'Проверьте, что последовательный обход `{self.post_list_url}` '
+            'по ссылкам `next` возвращает все опубликованные посты '
+            'без пропусков и повторов в порядке (-created, -id).'
+        )
+
+    def test_previous_link(self, client, published_posts):
+        first = client.get(f'{self.post_list_url}?page_size=5').json()
+        assert first['previous'] is None, (
+            'Проверьте, что у первой страницы нет ссылки `previous`.'
+        )
+        second = client.get(first['next']).json()
+        back = client.get(second['previous']).json()
+        assert back['results'] == first['results'], (
+            'Проверьте, что ссылка `previous` возвращает на предыдущую '
+            'страницу.'
+        )
+        assert back['next'] == first['next']
+
+    def test_page_size_is_bounded(self, client, published_posts, settings):
+        settings.MAX_PAGE_SIZE = 10
+        response = client.get(f'{self.post_list_url}?page_size=1000')
+        assert len(response.json()['results']) == 10, (
+            'Проверьте, что `page_size` ограничен настройкой MAX_PAGE_SIZE.'
+        )
+
+    def test_last_page_has_no_next(self, client, published_posts):
+        response = client.get(f'{self.post_list_url}?page_size=100')
+        data = response.json()
+        assert len(data['results']) == published_posts.count()
+        assert data['next'] is None, (
+            'Проверьте, что у последней страницы нет ссылки `next`.'
+        )
+
+    @pytest.mark.parametrize(
+        'cursor',
+        (
+            'garbage',
+            'eyJyIjowfQ==',
+            # {"r":0,"p":[null,null]}
+            'eyJyIjowLCJwIjpbbnVsbCxudWxsXX0=',
+            # [1,2]
+            'WzEsMl0=',
+        ),
+    )
+    def test_invalid_cursor(self, client, cursor):
+        response = client.get(f'{self.post_list_url}?cursor={cursor}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает '
+            'ответ со статусом 404.'
+        )
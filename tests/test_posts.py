@@ -55,10 +55,11 @@ class TestPosts:
         )
 
         test_data = response.json()
-        assert isinstance(test_data, list), (
+        assert isinstance(test_data.get('results'), list), (
             'Проверьте, что GET-запрос авторизованного пользователя к '
-            f'`{self.post_list_url}` возвращает список.'
+            f'`{self.post_list_url}` возвращает список в поле `results`.'
         )
+        test_data = test_data['results']
 
         assert len(test_data) == Post.objects.filter(
             is_published=True
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+from tests.fixtures.fixture_user import token_client
+
+
+@pytest.fixture
+def many_posts(make_posts, user, another_user):
+    make_posts(30, authors=[user, another_user])
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+
+    def test_post_list_anonymous(self, client, many_posts,
+                                 assert_query_budget):
+        with assert_query_budget('api:api_posts'):
+            client.get(reverse('api:api_posts'))
+
+    def test_post_list_authorized(self, user_client, many_posts,
+                                  assert_query_budget):
+        with assert_query_budget('api:api_posts'):
+            user_client.get(reverse('api:api_posts'))
+
+    def test_post_detail(self, user_client, post, assert_query_budget):
+        with assert_query_budget('api:api_posts_detail'):
+            user_client.get(
+                reverse('api:api_posts_detail', kwargs={'pk': post.id})
+            )
+
+    def test_post_create(self, user_client, assert_query_budget):
+        with assert_query_budget('api:api_posts'):
+            user_client.post(
+                reverse('api:api_posts'),
+                data={'name': 'Новый пост', 'text': 'Текст'},
+            )
+
+
+def data_queries(context):
+    """Запросы без точек сохранения тестовой транзакции."""
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'SAVEPOINT' not in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestWriteQueries:
+
+    def get_url(self, post):
+        return reverse('api:api_posts_detail', kwargs={'pk': post.id})
+
+    def test_delete_is_single_query(self, user_client, post):
+        # Первый запрос кэширует токен.
+        user_client.get(self.get_url(post))
+        with CaptureQueriesContext(connection) as context:
+            user_client.delete(self.get_url(post))
+        queries = data_queries(context)
+        assert len(queries) == 1 and queries[0].startswith('DELETE'), (
+            'Проверьте, что DELETE к посту проверяет авторство в самом '
+            'запросе удаления и выполняет один SQL-запрос:\n'
+            + '\n'.join(queries)
+        )
+        assert not Post.objects.filter(pk=post.id).exists()
+
+    def test_patch_updates_only_given_fields(self, user_client, post):
+        user_client.get(self.get_url(post))
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(
+                self.get_url(post), {'is_published': True}
+            )
+        assert response.json()['is_published'] is True
+        queries = data_queries(context)
+        assert len(queries) == 2, '\n'.join(queries)
+        update = queries[0]
+        assert update.startswith('UPDATE') and '"name"' not in update, (
+            'Проверьте, что PATCH обновляет только переданные поля.'
+        )
+
+    def test_denied_write_keeps_post(self, user_client, another_user,
+                                     password, post):
+        another_client = token_client(another_user.username, password)
+        response = another_client.delete(self.get_url(post))
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert Post.objects.filter(pk=post.id).exists()
+        response = another_client.delete(
+            reverse('api:api_posts_detail', kwargs={'pk': post.id + 1})
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
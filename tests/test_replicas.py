@@ -0,0 +1,196 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from api.cache import bump_generation
+from api.middleware import ReplicaRoutingMiddleware
+from api.routers import ReplicaRouter, read_from_replica
+from posts.models import Post, PostStats
+
+User = get_user_model()
+
+REPLICA = 'replica_test'
+
+
+def assert_not_in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise AssertionError('Синхронный вызов кэша в цикле событий.')
+
+
+class EventLoopCheckingCache(LocMemCache):
+    """Кэш, запрещающий синхронные вызовы из цикла событий."""
+
+    def get(self, *args, **kwargs):
+        assert_not_in_event_loop()
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        assert_not_in_event_loop()
+        return super().set(*args, **kwargs)
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Реплика — отдельный файл SQLite со своими данными."""
+    connections.settings[REPLICA] = {
+        **connections.settings['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {},
+    }
+    with connections[REPLICA].schema_editor() as editor:
+        editor.create_model(User)
+        editor.create_model(Post)
+        editor.create_model(PostStats)
+    author = User.objects.using(REPLICA).create(username='ReplicaUser')
+    Post.objects.using(REPLICA).create(
+        name='Пост из реплики', text='Текст', author=author,
+        is_published=True,
+    )
+    settings.REPLICA_DATABASES = [REPLICA]
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+class TestReplicaRouter:
+
+    router = ReplicaRouter()
+
+    def test_routing(self, settings):
+        settings.REPLICA_DATABASES = [REPLICA]
+        assert self.router.db_for_read(Post) is None, (
+            'Проверьте, что вне запроса безопасным методом чтение идет '
+            'в основную базу.'
+        )
+        token = read_from_replica.set(True)
+        try:
+            assert self.router.db_for_read(Post) == REPLICA
+            assert self.router.db_for_read(Token) is None, (
+                'Проверьте, что токены всегда читаются из основной базы.'
+            )
+            assert self.router.db_for_write(Post) == 'default'
+        finally:
+            read_from_replica.reset(token)
+        assert self.router.allow_migrate(REPLICA, 'posts') is False
+
+    def test_without_replicas(self, settings):
+        settings.REPLICA_DATABASES = []
+        token = read_from_replica.set(True)
+        try:
+            assert self.router.db_for_read(Post) is None
+        finally:
+            read_from_replica.reset(token)
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+
+    post_list_url = '/posts/'
+
+    def get_names(self, client):
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        return [post['name'] for post in response.json()['results']]
+
+    def test_get_reads_from_replica(self, client, replica):
+        assert self.get_names(client) == ['Пост из реплики'], (
+            'Проверьте, что GET-запросы читают данные из реплики.'
+        )
+
+    def test_read_your_writes(self, client, user_client, replica):
+        response = user_client.post(
+            self.post_list_url,
+            data={'name': 'Новый пост', 'text': 'Текст', 'is_published': True},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_names(user_client) == ['Новый пост'], (
+            'Проверьте, что после записи клиент читает из основной базы '
+            'и видит свои изменения.'
+        )
+        assert self.get_names(client) == ['Пост из реплики'], (
+            'Проверьте, что другие клиенты продолжают читать из реплики.'
+        )
+
+        cache.clear()
+        assert self.get_names(user_client) == ['Пост из реплики'], (
+            'Проверьте, что по окончании окна после записи клиент снова '
+            'читает из реплики.'
+        )
+
+    def test_sticky_cache_alias(self, settings, user_client, replica):
+        settings.CACHES = {
+            **settings.CACHES,
+            'sticky': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'sticky',
+            },
+        }
+        settings.REPLICA_STICKY_CACHE = 'sticky'
+        user_client.post(
+            self.post_list_url,
+            data={'name': 'Новый пост', 'text': 'Текст', 'is_published': True},
+        )
+        cache.clear()
+        assert self.get_names(user_client) == ['Новый пост'], (
+            'Проверьте, что отметка о записи хранится в кэше '
+            '`REPLICA_STICKY_CACHE`.'
+        )
+        caches['sticky'].clear()
+        assert self.get_names(user_client) == ['Пост из реплики']
+
+    def test_replica_reads_after_write_are_not_cached(self, client, replica):
+        bump_generation()
+        self.get_names(client)
+        with CaptureQueriesContext(connections[replica]) as context:
+            self.get_names(client)
+        assert len(context) > 0, (
+            'Проверьте, что сразу после записи данные из реплики, которая '
+            'может отставать, не попадают в кэш ответов.'
+        )
+
+
+class TestAsyncReplicaRouting:
+
+    factory = AsyncRequestFactory()
+
+    def test_async_middleware_uses_async_cache(self, settings):
+        settings.CACHES = {
+            **settings.CACHES,
+            'sticky': {
+                'BACKEND': 'tests.test_replicas.EventLoopCheckingCache',
+                'LOCATION': 'async-sticky',
+            },
+        }
+        settings.REPLICA_STICKY_CACHE = 'sticky'
+        settings.REPLICA_DATABASES = [REPLICA]
+        routed = []
+
+        async def get_response(request):
+            routed.append(read_from_replica.get())
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        headers = {'Authorization': 'Token async'}
+        for method in ('get', 'post', 'get'):
+            request = getattr(self.factory, method)('/posts/', headers=headers)
+            async_to_sync(middleware)(request)
+        assert routed == [True, False, False], (
+            'Проверьте, что под ASGI отметка о записи сохраняется и '
+            'читается через асинхронный API кэша, а не синхронными '
+            'вызовами в цикле событий.'
+        )
+        caches['sticky'].clear()
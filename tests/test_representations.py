@@ -0,0 +1,48 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import ORJSONRenderer
+from api.representations import post_representation, post_values
+from api.serializers import PostSerializer
+from posts.models import Post
+
+
+@pytest.fixture
+def posts(make_posts, user, another_user):
+    make_posts(
+        5,
+        name='Пост {number} "особый"',
+        text='Текст\n поста {number} \u2028 \\ 😀',
+        authors=[user, another_user],
+        is_published=lambda number: bool(number % 2),
+    )
+    return Post.objects.order_by('id')
+
+
+@pytest.mark.django_db
+class TestFastRepresentation:
+
+    def test_matches_serializer(self, posts):
+        expected = JSONRenderer().render(
+            PostSerializer(posts.select_related('author'), many=True).data
+        )
+        actual = ORJSONRenderer().render(
+            [post_representation(row) for row in post_values(posts)]
+        )
+        assert actual == expected, (
+            'Проверьте, что быстрое представление постов побайтно совпадает '
+            'с выводом PostSerializer и JSONRenderer.'
+        )
+
+    def test_detail_response_matches_serializer(self, client, posts):
+        post = posts.first()
+        response = client.get(f'/posts/{post.id}/')
+        assert response.content == JSONRenderer().render(
+            PostSerializer(post).data
+        )
+
+    def test_renderer_falls_back_for_indent(self):
+        data = {'name': 'Пост'}
+        assert ORJSONRenderer().render(
+            data, 'application/json; indent=4'
+        ) == JSONRenderer().render(data, 'application/json; indent=4')
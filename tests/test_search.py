@@ -0,0 +1,120 @@
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from django.db import connection
+
+from api.views import delete_posts
+from posts.models import Post
+from posts.search import SEARCH_TRIGGERS, ensure_search_triggers
+
+
+@pytest.fixture
+def searchable_posts(user):
+    Post.objects.bulk_create(
+        Post(
+            name=name,
+            text=text,
+            author=user,
+            is_published=is_published,
+        )
+        for name, text, is_published in (
+            ('Кошки', 'Про кошек и собак', True),
+            ('Собаки', 'Собаки, собаки и еще раз собаки', True),
+            ('Рыбы', 'Про аквариум', True),
+            ('Черновик', 'Собаки в черновике', False),
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestPostsSearch:
+
+    post_list_url = '/posts/'
+
+    def search(self, client, query, **params):
+        response = client.get(
+            self.post_list_url, {'q': query, **params}
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_search_ranks_published_posts(self, client, searchable_posts):
+        data = self.search(client, 'собаки')
+        names = [post['name'] for post in data['results']]
+        assert names == ['Собаки'], (
+            'Проверьте, что поиск по `?q=` возвращает только опубликованные '
+            'посты, содержащие слово.'
+        )
+
+        data = self.search(client, 'про')
+        assert {post['name'] for post in data['results']} == {
+            'Кошки', 'Рыбы'
+        }
+
+    def test_search_by_name_and_several_words(
+        self, client, searchable_posts
+    ):
+        data = self.search(client, 'кошки собак')
+        assert [post['name'] for post in data['results']] == ['Кошки'], (
+            'Проверьте, что поиск ищет по названию и тексту и требует '
+            'наличия всех слов запроса.'
+        )
+
+    def test_search_follows_changes(self, client, searchable_posts,
+                                    django_capture_on_commit_callbacks):
+        post = Post.objects.get(name='Рыбы')
+        post.text = 'Собаки тоже любят аквариумы'
+        with django_capture_on_commit_callbacks(execute=True):
+            post.save()
+        assert 'Рыбы' in [
+            post['name'] for post in self.search(client, 'собаки')['results']
+        ], 'Проверьте, что индекс поиска обновляется при изменении поста.'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            delete_posts(Post.objects.filter(name='Собаки'))
+        assert 'Собаки' not in [
+            post['name'] for post in self.search(client, 'собаки')['results']
+        ], 'Проверьте, что удаленные посты пропадают из поиска.'
+
+    def test_search_pagination(self, client, user):
+        Post.objects.bulk_create(
+            Post(
+                name=f'Пост {number}',
+                text='слово ' * (number + 1),
+                author=user,
+                is_published=True,
+            )
+            for number in range(7)
+        )
+        received = []
+        url = f'{self.post_list_url}?{urlencode({"q": "слово"})}&page_size=3'
+        while url:
+            data = client.get(url).json()
+            received.extend(post['id'] for post in data['results'])
+            url = data['next']
+        assert len(received) == len(set(received)) == 7, (
+            'Проверьте, что результаты поиска постранично обходятся '
+            'по ссылкам `next` без пропусков и повторов.'
+        )
+
+    @pytest.mark.parametrize('query', ('"', '***', '   '))
+    def test_query_without_words(self, client, searchable_posts, query):
+        data = self.search(client, query)
+        assert isinstance(data['results'], list), (
+            'Проверьте, что запрос без слов не приводит к ошибке.'
+        )
+
+    def test_triggers_are_restored(self, user):
+        with connection.cursor() as cursor:
+            for name in SEARCH_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER {name}')
+        Post.objects.create(name='Потерянный', text='пост', author=user)
+
+        ensure_search_triggers(connection)
+        assert Post.objects.filter(
+            search__document__match='потерянный'
+        ).exists(), (
+            'Проверьте, что после восстановления триггеров индекс поиска '
+            'перестраивается.'
+        )
@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from posts.models import AuthorPostStats, Post, PostStats
+from posts.stats import POSTGRES_TRIGGERS, SQLITE_TRIGGERS
+
+
+def get_counters(author=None):
+    if author is None:
+        stats = PostStats.get()
+    else:
+        stats = AuthorPostStats.objects.filter(author=author).first()
+        if stats is None:
+            return 0, 0
+    return stats.published, stats.drafts
+
+
+def count_posts(**filters):
+    posts = Post.objects.filter(**filters)
+    return (
+        posts.filter(is_published=True).count(),
+        posts.filter(is_published=False).count(),
+    )
+
+
+@pytest.mark.django_db
+class TestPostStats:
+
+    stats_url = '/posts/stats/'
+    post_list_url = '/posts/'
+    bulk_url = '/posts/bulk/'
+
+    def assert_counters_match(self, *authors):
+        assert get_counters() == count_posts(), (
+            'Проверьте, что общие счетчики постов совпадают с числом '
+            'опубликованных постов и черновиков.'
+        )
+        for author in authors:
+            assert get_counters(author) == count_posts(author=author), (
+                'Проверьте, что счетчики автора совпадают с числом его '
+                'опубликованных постов и черновиков.'
+            )
+
+    def test_counters_follow_changes(self, user_client, user, another_user):
+        response = user_client.post(
+            self.post_list_url, {'name': 'Пост', 'text': 'Текст'}
+        )
+        post_id = response.json()['id']
+        assert get_counters(user) == (0, 1)
+        self.assert_counters_match(user)
+
+        user_client.patch(
+            f'{self.post_list_url}{post_id}/', {'is_published': True}
+        )
+        assert get_counters(user) == (1, 0), (
+            'Проверьте, что публикация черновика переносит его из счетчика '
+            'черновиков в счетчик опубликованных постов.'
+        )
+
+        user_client.post(
+            self.bulk_url,
+            data=[
+                {'name': f'Пост {number}', 'text': 'Текст'}
+                for number in range(5)
+            ],
+            format='json',
+        )
+        ids = list(
+            Post.objects.filter(is_published=False).values_list(
+                'id', flat=True
+            )
+        )
+        user_client.patch(
+            self.bulk_url,
+            data=[{'id': pk, 'is_published': True} for pk in ids[:2]],
+            format='json',
+        )
+        self.assert_counters_match(user)
+        assert get_counters(user) == (3, 3)
+
+        Post.objects.filter(pk__in=ids[2:4]).update(
+            is_published=True, author=another_user
+        )
+        self.assert_counters_match(user, another_user)
+
+        user_client.delete(f'{self.post_list_url}{post_id}/')
+        Post.objects.filter(author=another_user).delete()
+        self.assert_counters_match(user, another_user)
+        assert get_counters() == (2, 1)
+
+    def test_counters_are_transactional(self, user):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Post.objects.create(name='Пост', text='Текст', author=user)
+                raise RuntimeError
+        assert get_counters(user) == (0, 0), (
+            'Проверьте, что счетчики обновляются в той же транзакции, '
+            'что и посты.'
+        )
+
+    def test_triggers_support_old_sqlite(self):
+        for sql in (*SQLITE_TRIGGERS.values(), *POSTGRES_TRIGGERS.values()):
+            assert 'IS DISTINCT FROM' not in sql, (
+                'Проверьте, что триггеры счетчиков не используют '
+                '`IS DISTINCT FROM`: SQLite поддерживает его только '
+                'с версии 3.39.'
+            )
+
+    def test_author_deletion(self, user, another_user):
+        Post.objects.create(
+            name='Пост', text='Текст', author=user, is_published=True
+        )
+        Post.objects.create(name='Пост', text='Текст', author=another_user)
+        user.delete()
+        self.assert_counters_match(another_user)
+        assert not AuthorPostStats.objects.filter(author_id=user.id).exists()
+
+    def test_endpoint(self, client, user, another_user, post,
+                      django_assert_max_num_queries):
+        Post.objects.bulk_create(
+            Post(
+                name=f'Пост {number}',
+                text='Текст',
+                author=another_user,
+                is_published=True,
+            )
+            for number in range(3)
+        )
+        with django_assert_max_num_queries(2):
+            response = client.get(self.stats_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'published': 3,
+            'drafts': 1,
+            'authors': [
+                {'author': another_user.username, 'published': 3,
+                 'drafts': 0},
+                {'author': user.username, 'published': 0, 'drafts': 1},
+            ],
+        }, (
+            f'Проверьте, что `{self.stats_url}` возвращает общие счетчики '
+            'и авторов по убыванию числа опубликованных постов.'
+        )
+
+    def test_endpoint_author(self, client, user, super_user, post):
+        response = client.get(self.stats_url, {'author': user.username})
+        assert response.json() == {
+            'author': user.username, 'published': 0, 'drafts': 1,
+        }
+        response = client.get(self.stats_url, {'author': super_user.username})
+        assert response.json() == {
+            'author': super_user.username, 'published': 0, 'drafts': 0,
+        }, 'Проверьте, что у автора без постов счетчики равны нулю.'
+        response = client.get(self.stats_url, {'author': 'nobody'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+from api.async_views import aapi_posts
+from api.throttling import fallback_cache
+from tests.fixtures.fixture_user import token_client
+
+
+@pytest.fixture
+def throttle_rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': rates,
+        }
+
+    return set_rates
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    post_list_url = '/posts/'
+    VALID_DATA = {'name': 'Новый пост', 'text': 'Текст нового поста'}
+
+    def test_anonymous_limit(self, client, throttle_rates):
+        # Нормы в сутки, чтобы окно счетчика не сменилось посреди теста.
+        throttle_rates(anon='2/day')
+        for remaining in (1, 0):
+            response = client.get(self.post_list_url)
+            assert response.status_code == HTTPStatus.OK
+            assert response['RateLimit-Limit'] == '2'
+            assert response['RateLimit-Remaining'] == str(remaining), (
+                'Проверьте, что ответ содержит заголовок RateLimit-Remaining '
+                'с числом оставшихся запросов.'
+            )
+            assert 0 < int(response['RateLimit-Reset']) <= 24 * 60 * 60
+
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что при превышении нормы запросов возвращается '
+            'ответ со статусом 429.'
+        )
+        assert 0 < int(response['Retry-After']) <= 24 * 60 * 60, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            'Retry-After.'
+        )
+
+    def test_users_are_counted_separately(
+        self, user, another_user, password, throttle_rates
+    ):
+        throttle_rates(user='2/day')
+        # Получение токена тоже расходует норму пользователя.
+        client = token_client(user.username, password)
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK
+        assert client.get(self.post_list_url).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        another_client = token_client(another_user.username, password)
+        assert another_client.get(self.post_list_url).status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что норма запросов считается для каждого клиента.'
+
+    def test_endpoint_write_limit(self, user, password, throttle_rates):
+        throttle_rates(
+            user='100/day', write='100/day', **{'write:api_posts': '1/day'}
+        )
+        client = token_client(user.username, password)
+        response = client.post(self.post_list_url, self.VALID_DATA)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response['RateLimit-Remaining'] == '0', (
+            'Проверьте, что заголовки RateLimit описывают самое строгое '
+            'из примененных ограничений.'
+        )
+
+        response = client.post(
+            self.post_list_url, {**self.VALID_DATA, 'name': 'Второй пост'}
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что для записи через `/posts/` действует отдельная '
+            'норма из DEFAULT_THROTTLE_RATES.'
+        )
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK, (
+            'Проверьте, что норма записи не ограничивает чтение.'
+        )
+
+    def test_fallback_to_local_memory(self, client, settings, throttle_rates):
+        settings.THROTTLE_CACHE = 'missing'
+        throttle_rates(anon='1/day')
+        fallback_cache.clear()
+        assert client.get(self.post_list_url).status_code == HTTPStatus.OK
+        assert client.get(self.post_list_url).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что при недоступности общего хранилища счетчики '
+            'хранятся в локальной памяти процесса.'
+        )
+        fallback_cache.clear()
+
+    def test_async_view(self, throttle_rates):
+        throttle_rates(anon='1/day')
+        factory = AsyncRequestFactory()
+        response = async_to_sync(aapi_posts)(factory.get(self.post_list_url))
+        assert response.status_code == HTTPStatus.OK
+        response = async_to_sync(aapi_posts)(factory.get(self.post_list_url))
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что асинхронные вью применяют ограничения частоты.'
+        )
+        assert int(response['Retry-After']) > 0